@@ -0,0 +1,591 @@
+"""Offline benchmarks for the Planviewer integration.
+
+Serves listing pages from a local aiohttp stand-in for planviewer.nl and
+drives PlanviewerApiClient and PlanviewerDataUpdateCoordinator against it, so
+performance changes can be compared between commits without touching the
+live site. Results are written as JSON.
+
+    python benchmarks/bench.py --output before.json
+    python benchmarks/bench.py --output after.json --compare before.json
+
+The coordinator scenarios need Home Assistant installed; without it only the
+parser and API client scenarios run.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import importlib
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+from datetime import date, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import aiohttp
+from aiohttp import web
+
+from fixtures import SIZES, announcement_paths, recorded_page, render_page
+
+COMPONENT_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "ha-planviewer"
+DEFAULT_COUNTS = [1, 10, 50, 100, 250, 500]
+
+def import_component(module: str):
+    """Import a module of the integration, whose directory name is not a valid package name."""
+    if "planviewer" not in sys.modules:
+        # An empty package keeps __init__.py (and with it Home Assistant) out of the parser scenarios
+        package = types.ModuleType("planviewer")
+        package.__path__ = [str(COMPONENT_DIR)]
+        sys.modules["planviewer"] = package
+    return importlib.import_module(f"planviewer.{module}")
+
+def percentile(values: list[float], pct: float) -> float:
+    """Return the pct-th percentile of a list of values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+def ms(seconds: float) -> float:
+    """Return seconds as milliseconds, rounded for the report."""
+    return round(seconds * 1000, 3)
+
+class StandInServer:
+    """Local stand-in for planviewer.nl serving listing pages of one fixture size."""
+
+    def __init__(self, size: str, latency: float) -> None:
+        """Initialize the server."""
+        self.size = size
+        self.latency = latency
+        self.requests = 0
+        self.bytes_sent = 0
+        self._pages: dict[tuple[str, int], str] = {}
+        self._published: dict[str, int] = {}  # Announcements published per municipality since the start
+        self._runner: web.AppRunner | None = None
+
+    def page(self, municipality: str, page: int) -> str | None:
+        """Return a listing page, rendering it once so rendering is not measured."""
+        spec = SIZES[self.size]
+        if page > spec["pages"]:
+            return None
+        key = (municipality, page)
+        if key not in self._pages:
+            recorded = recorded_page(self.size) if page == 1 else None
+            if recorded is not None:
+                self._pages[key] = recorded
+            else:
+                published = self._published.get(municipality, 0)
+                paths = [f"/lb/overheid/{municipality}/bekendmaking/gmb-2025-{number}/nieuw-{number}" for number in range(published, 0, -1)]
+                paths += announcement_paths(municipality, spec["items"] * spec["pages"])
+                chunk = paths[(page - 1) * spec["items"]:page * spec["items"]]
+                self._pages[key] = render_page(chunk, spec["nav_links"])
+        return self._pages[key]
+
+    def publish(self, municipality: str) -> None:
+        """Put a new announcement at the top of the listing of a municipality."""
+        self._published[municipality] = self._published.get(municipality, 0) + 1
+        self._pages = {key: html for key, html in self._pages.items() if key[0] != municipality}
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        """Serve a listing page after the configured latency."""
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        html = self.page(request.match_info["municipality"], int(request.query.get("page", 1)))
+        if html is None:
+            return web.Response(status=404)
+        self.bytes_sent += len(html)
+        return web.Response(text=html, content_type="text/html")
+
+    async def async_start(self) -> str:
+        """Start the server and return its base URL."""
+        app = web.Application()
+        app.router.add_get("/lb/overheid/{municipality}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    async def async_stop(self) -> None:
+        """Stop the server."""
+        await self._runner.cleanup()
+
+def bench_parse(size: str, repeat: int) -> dict:
+    """Time both parser engines on the first page of a fixture size."""
+    api = import_component("api")
+    html = StandInServer(size, 0).page("benchmark", 1)
+    result = {"bytes": len(html)}
+    for engine in (api.PARSER_LXML, api.PARSER_SOUP):
+        timings = []
+        for _ in range(repeat):
+            announcements, seconds = api.timed_call(api.parse_announcements, html, engine)
+            timings.append(seconds)
+        result[engine] = {"items": len(announcements), "median_ms": ms(statistics.median(timings)), "p95_ms": ms(percentile(timings, 95))}
+    return result
+
+def legacy_announcement(record) -> dict:
+    """Return an announcement as the dict earlier versions kept, with datum_eind as shown in the list."""
+    return {
+        "vergunning": record.vergunning,
+        "datum_start": record.datum_start,
+        "datum_eind": record.datum_eind.strftime("%d-%m-%Y") if record.datum_eind else None,
+        "link": record.link,
+    }
+
+def bench_memory(municipalities: int, items: int) -> dict:
+    """Compare the memory held by full histories as announcement records and as dicts."""
+    api = import_component("api")
+    api.parse_announcements(render_page(announcement_paths("warmup", 1), 0))  # Keep one-time caches out of the trace
+    result = {"announcements": municipalities * items}
+    for representation in ("dict", "record"):
+        gc.collect()
+        tracemalloc.start()
+        histories = []
+        for index in range(municipalities):
+            municipality = f"gemeente-{index}"
+            records = api.parse_announcements(render_page(announcement_paths(municipality, items), 0), municipality=municipality)
+            histories.append([legacy_announcement(record) for record in records] if representation == "dict" else records)
+            del records
+        gc.collect()
+        held = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del histories
+        result[representation] = {"kib": round(held / 1024, 1), "bytes_per_announcement": round(held / result["announcements"], 1)}
+    result["record_to_dict_ratio"] = round(result["record"]["kib"] / result["dict"]["kib"], 3)
+    return result
+
+def build_histories(municipalities: int, items: int) -> list:
+    """Return full announcement histories of generated municipalities."""
+    api = import_component("api")
+    history_module = import_component("history")
+    histories = []
+    for index in range(municipalities):
+        municipality = f"gemeente-{index}"
+        history = history_module.AnnouncementHistory(municipality, items)
+        history.merge(api.parse_announcements(render_page(announcement_paths(municipality, items), 0), municipality=municipality))
+        histories.append(history)
+    return histories
+
+SEARCH_QUERIES = ["dakkapel", "dakkapel OR boom kappen", "markt dakkapel woning"]
+
+def bench_search(municipalities: int, items: int, repeat: int) -> dict:
+    """Time keyword queries over the inverted indexes of full histories."""
+    search = import_component("search")
+    histories = build_histories(municipalities, items)
+    result = {"announcements": municipalities * items}
+    for text in SEARCH_QUERIES:
+        query = search.SearchQuery.parse(text)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            matches = 0
+            for history in histories:
+                links = history.terms.search(query)
+                matches += len(links)
+                history.latest_matching(20, links)
+            timings.append(time.perf_counter() - start)
+        result[text] = {"matches": matches, "median_ms": ms(statistics.median(timings))}
+    return result
+
+CALENDAR_VIEWS = {"week": 7, "month": 42}  # Days a calendar view asks events for; a month view spans six weeks
+
+def bench_calendar(municipalities: int, items: int, repeat: int) -> dict:
+    """Time calendar range queries over full histories, through the interval index and by scanning every announcement."""
+    periods = import_component("periods")
+    histories = build_histories(municipalities, items)
+    result = {"announcements": municipalities * items}
+    for view, days in CALENDAR_VIEWS.items():
+        # Scroll through the year, one view at a time, as the calendar does
+        windows = [(date(2024, 1, 1) + timedelta(days=offset), date(2024, 1, 1) + timedelta(days=offset + days)) for offset in range(0, 365, days)]
+        timings = {"index": [], "scan": []}
+        matches = {}
+        for _ in range(repeat):
+            for method in timings:
+                start = time.perf_counter()
+                count = 0
+                for first, last in windows:
+                    for history in histories:
+                        if method == "index":
+                            count += len(history.running(first, last))
+                        else:
+                            count += sum(1 for item in history.items if (span := periods.announcement_span(item)) and span[0] < last and span[1] > first)
+                timings[method].append((time.perf_counter() - start) / len(windows))
+                matches[method] = count // len(windows)
+        result[view] = {method: {"matches_per_view": matches[method], "median_ms": ms(statistics.median(values))} for method, values in timings.items()}
+    return result
+
+async def bench_scrape(size: str, repeat: int, latency: float) -> dict:
+    """Time async_scrape_data end to end, split in fetch and parse, with a fresh client per run."""
+    api = import_component("api")
+    server = StandInServer(size, latency)
+    base_url = await server.async_start()
+    totals, parses = [], []
+    async with aiohttp.ClientSession() as session:
+        for _ in range(repeat):
+            client = api.PlanviewerApiClient(session, base_url=base_url)
+            start = time.perf_counter()
+            await client.async_scrape_data("benchmark")
+            totals.append(time.perf_counter() - start)
+            parses.append(client.last_parse_stats["benchmark"]["parse_seconds"])
+    await server.async_stop()
+    fetches = [total - parse for total, parse in zip(totals, parses)]
+    return {
+        "total_median_ms": ms(statistics.median(totals)),
+        "fetch_median_ms": ms(statistics.median(fetches)),
+        "parse_median_ms": ms(statistics.median(parses)),
+        "bytes_per_request": server.bytes_sent // max(server.requests, 1),
+    }
+
+async def bench_transport(size: str, repeat: int, latency: float) -> dict:
+    """Compare a new connection per request with the kept-alive session of the integration."""
+    api = import_component("api")
+    transport = import_component("transport")
+    server = StandInServer(size, latency)
+    base_url = await server.async_start()
+    result = {}
+    for name, force_close in (("new_connection", True), ("keep_alive", False)):
+        stats = transport.TransportStats()
+        session = transport.create_session(stats)
+        if force_close:
+            await session.close()
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(force_close=True),
+                trace_configs=[stats.trace_config()],
+            )
+        client = api.PlanviewerApiClient(session, request_rate=1000, base_url=base_url)
+        totals = []
+        for index in range(repeat):
+            start = time.perf_counter()
+            await client.async_scrape_data(f"gemeente-{index}")
+            totals.append(time.perf_counter() - start)
+        await session.close()
+        result[name] = {
+            "total_median_ms": ms(statistics.median(totals)),
+            "connections_created": stats.connections_created,
+            "connect_median_ms": ms(stats.connect.percentile(50) or 0),
+        }
+    await server.async_stop()
+    return result
+
+async def _run_coordinators(count: int, size: str, latency: float, backfill_pages: int, request_rate: float) -> dict:
+    """Set up one coordinator per municipality and refresh them all at once."""
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers import issue_registry as ir
+
+    coordinator_module = import_component("coordinator")
+    api = import_component("api")
+    hub_module = import_component("hub")
+
+    server = StandInServer(size, latency)
+    base_url = await server.async_start()
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        await ir.async_load(hass)  # The hub raises repair issues for failing municipalities
+        async with aiohttp.ClientSession() as session:
+            client = api.PlanviewerApiClient(session, request_rate=request_rate, base_url=base_url)
+            hub = hub_module.PlanviewerFetchHub(hass, client)
+            coordinators = []
+            for index in range(count):
+                entry = SimpleNamespace(
+                    entry_id=f"benchmark{index}",
+                    data={"municipality": f"gemeente-{index}", "instance_name": f"Benchmark {index}"},
+                    options={"backfill_pages": backfill_pages},
+                )
+                coordinator = coordinator_module.PlanviewerDataUpdateCoordinator(hass, entry, hub)
+                coordinator.config_entry = entry  # As async_setup_entry does, the base class resets it
+                for municipality in coordinator.municipalities:
+                    hub.async_subscribe(municipality, coordinator)
+                coordinators.append(coordinator)
+
+            latencies: list[float] = []
+
+            async def refresh(coordinator) -> None:
+                start = time.perf_counter()
+                await coordinator.async_refresh()
+                latencies.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(refresh(coordinator) for coordinator in coordinators))
+            wall = time.perf_counter() - start
+            failed = sum(1 for coordinator in coordinators if coordinator.last_update_error)
+        await hass.async_stop(force=True)
+    await server.async_stop()
+    return {
+        "wall_ms": ms(wall),
+        "throughput_per_s": round(count / wall, 2),
+        "refresh_p50_ms": ms(percentile(latencies, 50)),
+        "refresh_p95_ms": ms(percentile(latencies, 95)),
+        "requests": server.requests,
+        "bytes": server.bytes_sent,
+        "failed": failed,
+    }
+
+async def _set_up_entries(config_dir: str, count: int, server: StandInServer, base_url: str) -> dict:
+    """Set up count entries at once as async_setup_entry does, then stop so their snapshots are written."""
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers import issue_registry as ir
+
+    coordinator_module = import_component("coordinator")
+    api = import_component("api")
+    hub_module = import_component("hub")
+
+    hass = HomeAssistant(config_dir)
+    await ir.async_load(hass)
+    requests = server.requests
+    async with aiohttp.ClientSession() as session:
+        client = api.PlanviewerApiClient(session, request_rate=1000, base_url=base_url)
+        hub = hub_module.PlanviewerFetchHub(hass, client)
+        restored = 0
+
+        async def set_up(index: int) -> None:
+            nonlocal restored
+            entry = SimpleNamespace(
+                entry_id=f"benchmark{index}",
+                data={"municipality": f"gemeente-{index}", "instance_name": f"Benchmark {index}"},
+                options={"backfill_pages": 1},
+            )
+            coordinator = coordinator_module.PlanviewerDataUpdateCoordinator(hass, entry, hub)
+            coordinator.config_entry = entry
+            hub.async_subscribe(entry.data["municipality"], coordinator)
+            if await coordinator.async_restore():
+                restored += 1  # The live refresh runs in the background, after setup
+            else:
+                await coordinator.async_refresh()
+
+        start = time.perf_counter()
+        await hub.async_load()
+        await asyncio.gather(*(set_up(index) for index in range(count)))
+        wall = time.perf_counter() - start
+        result = {"setup_ms": ms(wall), "requests": server.requests - requests, "restored": restored}
+        await hass.async_stop(force=True)  # Writes the delayed snapshot saves
+    return result
+
+async def bench_startup(count: int, size: str, latency: float) -> dict:
+    """Time setting up entries without a snapshot, and again with the snapshots the first run left."""
+    server = StandInServer(size, latency)
+    base_url = await server.async_start()
+    with tempfile.TemporaryDirectory() as config_dir:
+        cold = await _set_up_entries(config_dir, count, server, base_url)
+        warm = await _set_up_entries(config_dir, count, server, base_url)
+    await server.async_stop()
+    return {"entries": count, "cold": cold, "warm": warm}
+
+RECORDER_MUNICIPALITIES = 3  # Municipalities of the entry in the recorder scenario
+RECORDER_PUBLISH_EVERY = 4  # Polls between newly published announcements
+RECORDER_EXCLUDED_ATTRIBUTES = frozenset({"attribution", "restored", "supported_features"})  # Never recorded for any entity
+
+async def bench_recorder(size: str, polls: int) -> dict:
+    """Count state writes of the entities of one entry over a day of polls, and the recorder rows and bytes they cause.
+
+    A day is polls polls, 24 at the default scan interval, and the clock moves
+    on by the scan interval between them. Rows and bytes follow
+    how the recorder stores states: a states row holding the state per state
+    change, and a state_attributes row per attribute set it has not stored
+    before, holding the recorded attributes as JSON.
+    """
+    import logging
+
+    from homeassistant.const import EVENT_STATE_CHANGED
+    from homeassistant.core import HomeAssistant, StateMachine, callback
+    from homeassistant.helpers import device_registry as dr, entity, entity_registry as er, issue_registry as ir
+    from homeassistant.helpers.entity_platform import EntityPlatform
+    from homeassistant.helpers.json import json_bytes
+    from homeassistant.util import dt as dt_util
+
+    const = import_component("const")
+    coordinator_module = import_component("coordinator")
+    api = import_component("api")
+    hub_module = import_component("hub")
+    platforms = {"sensor": import_component("sensor"), "calendar": import_component("calendar")}
+
+    server = StandInServer(size, 0)
+    base_url = await server.async_start()
+    municipalities = [f"gemeente-{index}" for index in range(RECORDER_MUNICIPALITIES)]
+    result = {"polls": polls, "published": 0, "state_writes": 0, "states_rows": 0, "state_attributes_rows": 0, "state_bytes": 0, "attribute_bytes": 0}
+    stored_attributes: set[bytes] = set()
+
+    @callback
+    def record(event) -> None:
+        if (state := event.data["new_state"]) is None:
+            return
+        result["states_rows"] += 1
+        result["state_bytes"] += len(state.state.encode())
+        excluded = RECORDER_EXCLUDED_ATTRIBUTES | (state.state_info["unrecorded_attributes"] if state.state_info else frozenset())
+        shared_attributes = json_bytes({key: value for key, value in state.attributes.items() if key not in excluded})
+        if shared_attributes not in stored_attributes:
+            stored_attributes.add(shared_attributes)
+            result["state_attributes_rows"] += 1
+            result["attribute_bytes"] += len(shared_attributes)
+
+    async_set = StateMachine.async_set
+    now, utcnow = dt_util.now, dt_util.utcnow
+
+    def counting_async_set(self, *args, **kwargs) -> None:
+        result["state_writes"] += 1
+        async_set(self, *args, **kwargs)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        entity.async_setup(hass)
+        await asyncio.gather(ir.async_load(hass), er.async_load(hass), dr.async_load(hass))
+        async with aiohttp.ClientSession() as session:
+            client = api.PlanviewerApiClient(session, request_rate=1000, base_url=base_url)
+            hub = hub_module.PlanviewerFetchHub(hass, client)
+            entry = SimpleNamespace(
+                entry_id="benchmark",
+                data={"municipalities": municipalities, "instance_name": "Benchmark"},
+                options={"backfill_pages": 1},
+                async_on_unload=lambda unsubscribe: None,
+                pref_disable_polling=True,  # The scenario polls by itself
+            )
+            coordinator = coordinator_module.PlanviewerDataUpdateCoordinator(hass, entry, hub)
+            coordinator.config_entry = entry
+            for municipality in coordinator.municipalities:
+                hub.async_subscribe(municipality, coordinator)
+            hass.data[const.DOMAIN] = {entry.entry_id: coordinator}
+            await coordinator.async_refresh()
+            for domain, module in platforms.items():
+                platform = EntityPlatform(
+                    hass=hass,
+                    logger=logging.getLogger(__name__),
+                    domain=domain,
+                    platform_name=const.DOMAIN,
+                    platform=None,
+                    scan_interval=timedelta(seconds=30),
+                    entity_namespace=None,
+                )
+                # As Home Assistant does, adding is scheduled and setup does not wait for it
+                await module.async_setup_entry(hass, entry, lambda entities, platform=platform: hass.async_create_task(platform.async_add_entities(entities)))
+            await hass.async_block_till_done()
+
+            # Only the day of polls after setup is counted
+            hass.bus.async_listen(EVENT_STATE_CHANGED, record)
+            StateMachine.async_set = counting_async_set
+            try:
+                for poll in range(polls):
+                    offset = timedelta(seconds=const.DEFAULT_SCAN_INTERVAL * (poll + 1))
+                    dt_util.now = lambda time_zone=None, offset=offset: now(time_zone) + offset
+                    dt_util.utcnow = lambda offset=offset: utcnow() + offset
+                    if poll % RECORDER_PUBLISH_EVERY == 0:
+                        server.publish(municipalities[result["published"] % len(municipalities)])
+                        result["published"] += 1
+                    await coordinator.async_refresh()
+                    await hass.async_block_till_done()
+            finally:
+                StateMachine.async_set = async_set
+                dt_util.now, dt_util.utcnow = now, utcnow
+        await hass.async_stop(force=True)
+    await server.async_stop()
+    result["bytes"] = result["state_bytes"] + result["attribute_bytes"]
+    return result
+
+async def bench_coordinators(counts: list[int], size: str, latency: float, backfill_pages: int, request_rate: float) -> dict:
+    """Scale the number of municipalities, timing one run and tracing memory in another."""
+    results = {}
+    for count in counts:
+        result = await _run_coordinators(count, size, latency, backfill_pages, request_rate)
+        tracemalloc.start()
+        await _run_coordinators(count, size, latency, backfill_pages, request_rate)
+        result["peak_memory_kib"] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        tracemalloc.stop()
+        results[str(count)] = result
+        print(f"  {count:>4} municipalities: {result['wall_ms']:.0f} ms, {result['throughput_per_s']} /s, peak {result['peak_memory_kib']} KiB", file=sys.stderr)
+    return results
+
+def git_commit() -> str | None:
+    """Return the commit the benchmark ran on."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=COMPONENT_DIR).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def flatten(results: dict, prefix: str = "") -> dict[str, float]:
+    """Return the numeric leaves of a result tree keyed by their dotted path."""
+    leaves = {}
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            leaves.update(flatten(value, f"{path}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            leaves[path] = value
+    return leaves
+
+def compare(baseline: dict, current: dict) -> None:
+    """Print how every metric moved against a baseline result file."""
+    old, new = flatten(baseline["results"]), flatten(current["results"])
+    print(f"Compared with {baseline['meta'].get('commit')}:")
+    for path in sorted(old.keys() & new.keys()):
+        change = f"{(new[path] - old[path]) / old[path] * 100:+.1f}%" if old[path] else "n/a"
+        print(f"  {path}: {old[path]} -> {new[path]} ({change})")
+
+async def async_main(args: argparse.Namespace) -> dict:
+    """Run all scenarios."""
+    results: dict = {"parse": {}, "scrape": {}}
+    for size in SIZES:
+        print(f"Parsing {size} page", file=sys.stderr)
+        results["parse"][size] = bench_parse(size, args.repeat)
+        results["scrape"][size] = await bench_scrape(size, args.repeat, args.latency)
+
+    print(f"Measuring {args.memory_municipalities} histories of {args.memory_items} announcements", file=sys.stderr)
+    results["memory"] = bench_memory(args.memory_municipalities, args.memory_items)
+    print("Searching the same histories", file=sys.stderr)
+    results["search"] = bench_search(args.memory_municipalities, args.memory_items, args.repeat)
+    print("Querying calendar ranges over the same histories", file=sys.stderr)
+    results["calendar"] = bench_calendar(args.memory_municipalities, args.memory_items, args.repeat)
+
+    try:
+        import homeassistant  # noqa: F401
+    except ImportError:
+        print("Home Assistant is not installed, skipping coordinator scenarios", file=sys.stderr)
+    else:
+        print(f"Comparing connection reuse on {args.size} pages", file=sys.stderr)
+        results["transport"] = await bench_transport(args.size, args.repeat, args.latency)
+        print(f"Scaling coordinators on {args.size} pages", file=sys.stderr)
+        results["coordinators"] = await bench_coordinators(args.counts, args.size, args.latency, args.backfill_pages, args.request_rate)
+        print(f"Starting {args.startup_entries} entries with and without snapshots", file=sys.stderr)
+        results["startup"] = await bench_startup(args.startup_entries, args.size, args.latency)
+        print(f"Counting state writes and recorder rows over {args.recorder_polls} polls", file=sys.stderr)
+        results["recorder"] = await bench_recorder(args.size, args.recorder_polls)
+    return results
+
+def main() -> None:
+    """Parse arguments, run the benchmarks and write the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="bench_results.json", help="file to write the JSON results to")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per parser and scrape scenario")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds the stand-in server waits per request")
+    parser.add_argument("--size", choices=SIZES, default="typical", help="fixture size for the coordinator scenarios")
+    parser.add_argument("--request-rate", type=float, default=1000, help="requests per second allowed by the client rate limiter in the coordinator scenarios")
+    parser.add_argument("--backfill-pages", type=int, default=1, help="listing pages each coordinator crawls")
+    parser.add_argument("--memory-municipalities", type=int, default=100, help="histories kept for the memory, search and calendar scenarios")
+    parser.add_argument("--memory-items", type=int, default=500, help="announcements per history for the memory, search and calendar scenarios")
+    parser.add_argument("--startup-entries", type=int, default=25, help="entries set up in the startup scenario")
+    parser.add_argument("--recorder-polls", type=int, default=24, help="polls in the recorder scenario, a day at the default scan interval")
+    parser.add_argument("--counts", type=lambda value: [int(count) for count in value.split(",")], default=DEFAULT_COUNTS, help="comma separated municipality counts")
+    args = parser.parse_args()
+
+    current = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "latency": args.latency,
+            "repeat": args.repeat,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": asyncio.run(async_main(args)),
+    }
+    Path(args.output).write_text(json.dumps(current, indent=2), encoding="utf-8")
+    print(f"Results written to {args.output}", file=sys.stderr)
+    if args.compare:
+        compare(json.loads(Path(args.compare).read_text(encoding="utf-8")), current)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Municipality listing pages for the offline benchmarks.
+
+Pages follow the markup of https://www.planviewer.nl/lb/overheid/<municipality>.
+A page recorded from the live site can be used instead of a generated one by
+saving it as fixtures/<size>.html next to this file.
+"""
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+RECORDED_DIR = Path(__file__).parent / "fixtures"
+
+# Announcements per listing page, listing pages, and chrome (navigation links) around them
+SIZES = {
+    "small": {"items": 5, "pages": 1, "nav_links": 50},
+    "typical": {"items": 20, "pages": 5, "nav_links": 400},
+    "large": {"items": 500, "pages": 1, "nav_links": 3000},
+}
+
+WORDS = [
+    "omgevingsvergunning", "aanvraag", "verleend", "kappen", "boom", "dakkapel", "bouwen",
+    "woning", "aanbouw", "uitbreiden", "bedrijfspand", "hoofdstraat", "kerkplein", "markt",
+]
+
+def announcement_paths(municipality: str, count: int, seed: int = 0) -> list[str]:
+    """Return announcement links of a municipality, newest first."""
+    rng = random.Random(f"{municipality}-{seed}")
+    paths = []
+    for number in range(count, 0, -1):
+        slug = "-".join(rng.choice(WORDS) for _ in range(rng.randint(3, 7)))
+        paths.append(f"/lb/overheid/{municipality}/bekendmaking/gmb-2024-{number}/{slug}-{number}")
+    return paths
+
+def render_item(path: str, number: int) -> str:
+    """Return the markup of one announcement in the list."""
+    start = date(2024, number % 12 + 1, number % 28 + 1)
+    end = start + timedelta(weeks=6)  # The usual objection period
+    return (
+        f'<a href="{path}" class="tbl-btm-row"><div class="row">'
+        f'<span class="col-10 col-sm-6 col-md-7 tbl-btm-row-icon-col"><i class="fa fa-file"></i> Bekendmaking</span>'
+        f'<span class="col-6 col-sm-3 col-md-2">{start:%d-%m-%Y}</span>'
+        f'<span class="col-6 col-sm-3 col-md-3">{end:%d-%m-%Y}</span>'
+        f"</div></a>"
+    )
+
+def render_page(paths: list[str], nav_links: int) -> str:
+    """Return a full listing page holding the given announcement links."""
+    nav = "".join(f'<li class="nav-item"><a class="nav-link" href="/lb/overheid/gemeente-{i}">Gemeente {i}</a></li>' for i in range(nav_links))
+    items = "".join(render_item(path, number) for number, path in enumerate(paths))
+    return (
+        "<!DOCTYPE html><html lang=\"nl\"><head><meta charset=\"utf-8\"><title>Planviewer</title>"
+        "<link rel=\"stylesheet\" href=\"/css/app.css\"></head><body>"
+        f'<nav class="navbar"><ul class="navbar-nav">{nav}</ul></nav>'
+        '<div class="container"><div class="row"><h1>Bekendmakingen</h1></div><div class="row"></div>'
+        '<div class="row"></div><div class="row"></div><div class="row"></div>'
+        f'<div class="row"><div class="col-12 imro-address-list-page"><div class="list">{items}</div></div></div>'
+        "</div>"
+        f'<footer class="footer"><ul>{nav}</ul></footer><script src="/js/app.js"></script></body></html>'
+    )
+
+def recorded_page(size: str) -> str | None:
+    """Return a page recorded from the live site for a size, if one was saved."""
+    path = RECORDED_DIR / f"{size}.html"
+    return path.read_text(encoding="utf-8") if path.exists() else None
@@ -6,34 +6,73 @@ from datetime import timedelta
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 
 from .api import PlanviewerApiClient
-from .const import DOMAIN, CONF_MUNICIPALITY, PLATFORMS, DEFAULT_SCAN_INTERVAL, CONF_SCAN_INTERVAL
+from .const import (
+    DOMAIN,
+    CONF_MUNICIPALITY,
+    PLATFORMS,
+    DATA_HUB,
+    DATA_STARTUP_REFRESH,
+    STARTUP_REFRESH_STAGGER,
+    STORAGE_VERSION,
+)
 from .coordinator import PlanviewerDataUpdateCoordinator
+from .hub import PlanviewerFetchHub
+from .services import async_setup_services
+from .transport import async_get_transport
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Planviewer services, which serve every entry."""
+    async_setup_services(hass)
+    return True
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Planviewer from a config entry."""
     _LOGGER.debug("Setting up Planviewer entry: %s", entry.entry_id)
     hass.data.setdefault(DOMAIN, {})
 
-    session = async_get_clientsession(hass)
-    api_client = PlanviewerApiClient(session)
-
-    scan_interval_seconds = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    # One hub per Home Assistant instance, shared by every entry
+    hub = hass.data[DOMAIN].get(DATA_HUB)
+    if hub is None:
+        session, _, rate_limiter = async_get_transport(hass)
+        hub = hass.data[DOMAIN][DATA_HUB] = PlanviewerFetchHub(hass, PlanviewerApiClient(session, rate_limiter=rate_limiter))
+    await hub.async_load()  # Entries set up at the same time wait for the same load
 
     coordinator = PlanviewerDataUpdateCoordinator(
         hass=hass,
         config_entry=entry,
+        hub=hub,
     )
 
     # Store the config entry in the coordinator (you might need this later)
     coordinator.config_entry = entry
 
-    # Fetch initial data so we have it when entities are set up
-    await coordinator.async_config_entry_first_refresh()
+    # Entries watching the same municipality share a single fetch per cycle
+    for municipality in coordinator.municipalities:
+        entry.async_on_unload(hub.async_subscribe(municipality, coordinator))
+
+    if await coordinator.async_restore():
+        # Entities come up from the snapshot, the live refresh follows in the background
+        # Each refresh starts STARTUP_REFRESH_STAGGER seconds after the one scheduled before it
+        now = hass.loop.time()
+        start = max(now, hass.data.get(DATA_STARTUP_REFRESH, now))
+        hass.data[DATA_STARTUP_REFRESH] = start + STARTUP_REFRESH_STAGGER
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_delayed_refresh(start - now),
+            f"{DOMAIN} refresh {entry.entry_id}",
+        )
+    else:
+        # Nothing stored yet, fetch initial data so we have it when entities are set up
+        await coordinator.async_config_entry_first_refresh()
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
@@ -56,6 +95,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     return unload_ok
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored snapshot of a deleted config entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
     _LOGGER.debug("Reloading Planviewer entry due to options update: %s", entry.entry_id)
@@ -1,10 +1,324 @@
+import asyncio
+import hashlib
 import logging
+import re
+import time
 import aiohttp
 from bs4 import BeautifulSoup
-from datetime import datetime
+from urllib.parse import unquote, urlsplit
+from lxml import etree
+
+from .metrics import RollingStats, ScrapeMetrics
+from .models import Announcement, parse_list_date
+from .const import (
+    DEFAULT_PARSE_CONCURRENCY,
+    DEFAULT_PARSE_TIMEOUT,
+    DEFAULT_DETAIL_CONCURRENCY,
+    DEFAULT_REQUEST_RATE,
+    DEFAULT_REQUEST_BURST,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+CONTAINER_MARKER = "imro-address-list-page"  # Class of the element holding the announcements
+
+def container_fingerprint(html: str) -> str:
+    """Return a hash of the announcement container region of a municipality page."""
+    start = html.find(CONTAINER_MARKER)
+    if start == -1:
+        region = html
+    else:
+        # Everything below the container (footer, scripts) may change per request
+        end = html.find("<footer", start)
+        region = html[start:end] if end != -1 else html[start:]
+    return hashlib.sha256(region.encode()).hexdigest()
+
+BASE_URL = "https://www.planviewer.nl"
+PAGE_PARAM = "page"  # Query parameter of the paginated announcement list
+
+def announcement_id(link: str) -> str:
+    """Return a stable ID for an announcement, derived from the path of its link."""
+    return hashlib.sha1(urlsplit(link).path.rstrip("/").encode()).hexdigest()[:16]
+
+PARSER_LXML = "lxml"  # Fast path: XPath over the container region only
+PARSER_SOUP = "soup"  # Whole-document BeautifulSoup, kept as the fallback
+
+CONTAINER_SELECTOR = "div.container > div:nth-child(6) > div.col-12.imro-address-list-page > div"
+TITLE_CLASSES = ("col-10", "col-sm-6", "col-md-7", "tbl-btm-row-icon-col")
+TITLE_SELECTOR = "div > span." + ".".join(TITLE_CLASSES)
+
+def _build_announcement(municipality: str, relative_link: str | None, title_text: str | None, date_start_str: str | None, date_end_str: str | None) -> Announcement | None:
+    """Build an announcement from the raw strings of one list item."""
+    if title_text is None or not relative_link:
+        return None
+
+    link = f"{BASE_URL}{relative_link}"
+    slug_parts = relative_link.split('/')
+    if len(slug_parts) > 1:
+        full_message = slug_parts[-1].replace('-', ' ').strip()  # Use the full message from the link
+    else:
+        full_message = title_text
+
+    return Announcement(
+        municipality=municipality,
+        vergunning=full_message,
+        link=link,
+        status=title_text,
+        datum_start=parse_list_date(date_start_str),
+        datum_eind=parse_list_date(date_end_str),
+    )
+
+def _parse_soup(html: str, municipality: str, timings: dict[str, float]) -> list[Announcement] | None:
+    """Extract announcements with BeautifulSoup over the whole document."""
+    start = time.perf_counter()
+    soup = BeautifulSoup(html, "lxml")
+    timings["parse"] = time.perf_counter() - start
+    announcement_container = soup.select_one(CONTAINER_SELECTOR)
+    if not announcement_container:
+        return None
+
+    announcements = []
+    # Select 'a' tags that contain the specific span for the message
+    for item in announcement_container.select(f"a:has({TITLE_SELECTOR})"):
+        title_element = item.select_one(TITLE_SELECTOR)
+        date_start_element = item.select_one("div > span:nth-child(2)")
+        date_end_element = item.select_one("div > span:nth-child(3)")
+        announcement = _build_announcement(
+            municipality,
+            item.get("href"),
+            title_element.text.strip() if title_element else None,
+            date_start_element.text.strip() if date_start_element else None,
+            date_end_element.text.strip() if date_end_element else None,
+        )
+        if announcement is not None:
+            announcements.append(announcement)
+        else:
+            _LOGGER.debug(f"Skipping item without expected elements: {item}")
+    timings["extract"] = time.perf_counter() - start - timings["parse"]
+    return announcements
+
+def _xpath_has_classes(*classes: str) -> str:
+    """Return an XPath predicate matching elements that carry all given classes."""
+    return " and ".join(f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')" for cls in classes)
+
+_XPATH_CONTAINER = etree.XPath(f"//div[{_xpath_has_classes('col-12', CONTAINER_MARKER)}]/div[1]")
+_XPATH_ITEMS = etree.XPath(f".//a[.//div/span[{_xpath_has_classes(*TITLE_CLASSES)}]]")
+_XPATH_TITLE = etree.XPath(f"(.//div/span[{_xpath_has_classes(*TITLE_CLASSES)}])[1]")
+_XPATH_DATE_START = etree.XPath("(.//div/*[2][self::span])[1]")
+_XPATH_DATE_END = etree.XPath("(.//div/*[3][self::span])[1]")
+
+def _element_text(elements: list) -> str | None:
+    """Return the stripped text of the first element of an XPath result."""
+    return elements[0].xpath("string()").strip() if elements else None
+
+def _parse_lxml(html: str, municipality: str, timings: dict[str, float]) -> list[Announcement] | None:
+    """Extract announcements with lxml, building only the container region of the page."""
+    started = time.perf_counter()
+    start = html.find(CONTAINER_MARKER)
+    if start == -1:
+        return None
+    # Parse from the tag that opens the container up to the footer, skipping head and navigation
+    tag_start = max(html.rfind("<div", 0, start), 0)
+    end = html.find("<footer", start)
+    region = html[tag_start:end] if end != -1 else html[tag_start:]
+
+    root = etree.fromstring(region, etree.HTMLParser())
+    timings["parse"] = time.perf_counter() - started
+    if root is None:
+        return None
+    containers = _XPATH_CONTAINER(root)
+    if not containers:
+        return None
+
+    announcements = []
+    for item in _XPATH_ITEMS(containers[0]):
+        announcement = _build_announcement(
+            municipality,
+            item.get("href"),
+            _element_text(_XPATH_TITLE(item)),
+            _element_text(_XPATH_DATE_START(item)),
+            _element_text(_XPATH_DATE_END(item)),
+        )
+        if announcement is not None:
+            announcements.append(announcement)
+        else:
+            _LOGGER.debug(f"Skipping item without expected elements: {etree.tostring(item, encoding='unicode')}")
+    timings["extract"] = time.perf_counter() - started - timings["parse"]
+    return announcements
+
+PARSERS = {
+    PARSER_LXML: _parse_lxml,
+    PARSER_SOUP: _parse_soup,
+}
+
+def parse_announcements(
+    html: str,
+    parser: str = PARSER_LXML,
+    timings: dict[str, float] | None = None,
+    municipality: str = "",
+) -> list[Announcement] | None:
+    """Extract all announcements from a page of the given municipality.
+
+    Returns None when the announcement container is missing. The fast lxml path
+    falls back to BeautifulSoup if it cannot find or parse the container, and
+    both paths produce identical announcements. When a timings dict is
+    given, the seconds spent building the tree ("parse") and reading the
+    announcements from it ("extract") are stored in it.
+    """
+    if timings is None:
+        timings = {}
+    if parser != PARSER_SOUP:
+        try:
+            announcements = PARSERS[parser](html, municipality, timings)
+        except (etree.LxmlError, ValueError) as err:
+            _LOGGER.debug(f"Fast parser failed, falling back to BeautifulSoup: {err}")
+            announcements = None
+        if announcements is not None:
+            return announcements
+    return _parse_soup(html, municipality, timings)
+
+# Labels of the fields merged into announcements from their detail page
+DETAIL_LABELS = {
+    "adres": "adres",
+    "locatie": "adres",
+    "zaaknummer": "zaaknummer",
+    "kenmerk": "zaaknummer",
+    "dossiernummer": "zaaknummer",
+    "omschrijving": "omschrijving",
+    "onderwerp": "omschrijving",
+}
+
+def _normalize_label(label: str) -> str:
+    """Return a detail page label in the form used as key of DETAIL_LABELS."""
+    return label.strip().rstrip(":").strip().lower()
+
+def _coordinates(latitude: str | None, longitude: str | None) -> tuple[float, float] | None:
+    """Return a latitude/longitude pair read from a page, if it is a valid one."""
+    try:
+        point = float(latitude.replace(",", ".")), float(longitude.replace(",", "."))
+    except (AttributeError, ValueError):
+        return None
+    return point if -90 <= point[0] <= 90 and -180 <= point[1] <= 180 else None
+
+def _parse_detail_coordinates(root) -> tuple[float, float] | None:
+    """Find the location of an announcement in geo meta tags or on its map element."""
+    for name in ("geo.position", "ICBM"):
+        meta = root.find(f".//meta[@name='{name}']")
+        if meta is not None:
+            parts = meta.get("content", "").replace(";", ",").split(",")
+            if len(parts) == 2 and (point := _coordinates(*parts)):
+                return point
+    latitude = root.find(".//meta[@property='place:location:latitude']")
+    longitude = root.find(".//meta[@property='place:location:longitude']")
+    if latitude is not None and longitude is not None:
+        if point := _coordinates(latitude.get("content"), longitude.get("content")):
+            return point
+    for lat_attr, lon_attr in (("data-lat", "data-lng"), ("data-lat", "data-lon"), ("data-latitude", "data-longitude")):
+        for element in root.iterfind(f".//*[@{lat_attr}][@{lon_attr}]"):
+            if point := _coordinates(element.get(lat_attr), element.get(lon_attr)):
+                return point
+    return None
+
+def _parse_html(html: str):
+    """Return the root element of a whole page, or None for an empty one.
+
+    The page is handed to lxml as UTF-8 bytes, since it rejects strings that
+    open with an XML declaration naming an encoding.
+    """
+    if not html.strip():
+        return None
+    return etree.fromstring(html.encode(), etree.HTMLParser(encoding="utf-8"))
+
+def parse_detail(html: str) -> dict[str, str | float]:
+    """Extract address, case number, description and location from an announcement detail page.
+
+    Label/value pairs are read from definition lists and two-column table rows;
+    the meta description is used when no description is labelled. The location
+    comes from geo meta tags or the data attributes of the map element.
+    """
+    root = _parse_html(html)
+    if root is None:
+        return {}
+
+    pairs = []
+    for dt in root.iterfind(".//dt"):
+        dd = dt.getnext()
+        if dd is not None and dd.tag == "dd":
+            pairs.append((dt.xpath("string()"), dd.xpath("string()")))
+    for row in root.iterfind(".//tr"):
+        cells = [cell for cell in row if cell.tag in ("th", "td")]
+        if len(cells) == 2:
+            pairs.append((cells[0].xpath("string()"), cells[1].xpath("string()")))
+
+    details: dict[str, str | float] = {}
+    for label, value in pairs:
+        key = DETAIL_LABELS.get(_normalize_label(label))
+        value = " ".join(value.split())
+        if key and value and key not in details:
+            details[key] = value
+
+    if "omschrijving" not in details:
+        meta = root.find(".//meta[@name='description']")
+        if meta is not None and meta.get("content", "").strip():
+            details["omschrijving"] = meta.get("content").strip()
+
+    if point := _parse_detail_coordinates(root):
+        details["latitude"], details["longitude"] = point
+    return details
+
+MUNICIPALITY_LINK_PATTERN = re.compile(r"^(?:https?://[^/]+)?/lb/overheid/([^/?#]+)/?$")
+
+def parse_municipalities(html: str) -> dict[str, str]:
+    """Return the display name per municipality slug linked from the municipality overview page."""
+    root = _parse_html(html)
+    if root is None:
+        return {}
+
+    municipalities: dict[str, str] = {}
+    for anchor in root.iterfind(".//a[@href]"):
+        if match := MUNICIPALITY_LINK_PATTERN.match(anchor.get("href").strip()):
+            slug = unquote(match[1]).lower()
+            name = " ".join(anchor.xpath("string()").split())
+            municipalities.setdefault(slug, name or slug)
+    return municipalities
+
+def timed_call(func, *args):
+    """Run a parser function and return its result with the seconds it took."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+class TokenBucket:
+    """Rate limit shared by every request to Planviewer, allowing short bursts.
+
+    The bucket holds up to burst tokens and refills at rate tokens per second.
+    Each request takes a token, waiting for one when the bucket is empty;
+    waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize a full bucket."""
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def async_acquire(self) -> float:
+        """Take a token, waiting until one is available, and return the seconds waited."""
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            if self._updated is not None:
+                self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            wait = 0.0
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self._rate
+                await asyncio.sleep(wait)
+                self._tokens, self._updated = 1.0, now + wait
+            self._tokens -= 1
+            return wait
+
 class PlanviewerApiClientError(Exception):
     """Base exception for Planviewer API client errors."""
     pass
@@ -24,85 +338,261 @@ class PlanviewerApiDataError(PlanviewerApiClientError):
 class PlanviewerApiClient:
     """API client for Planviewer."""
 
-    def __init__(self, session: aiohttp.ClientSession) -> None:
-        """Initialize the client."""
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        parser: str = PARSER_LXML,
+        parse_concurrency: int = DEFAULT_PARSE_CONCURRENCY,
+        parse_timeout: float = DEFAULT_PARSE_TIMEOUT,
+        detail_concurrency: int = DEFAULT_DETAIL_CONCURRENCY,
+        request_rate: float = DEFAULT_REQUEST_RATE,
+        request_burst: int = DEFAULT_REQUEST_BURST,
+        rate_limiter: TokenBucket | None = None,
+        base_url: str = BASE_URL,
+    ) -> None:
+        """Initialize the client.
+
+        A rate_limiter shared with other clients replaces the one built from
+        request_rate and request_burst.
+        """
         self._session = session
+        self._base_url = base_url  # Pages are requested here; announcement links always point to BASE_URL
+        self._parser = parser
+        self._parse_semaphore = asyncio.Semaphore(parse_concurrency)  # Caps executor threads used for parsing
+        self._parse_timeout = parse_timeout
+        self.last_parse_stats: dict[str, dict[str, float]] = {}
+        self.metrics: dict[str, ScrapeMetrics] = {}  # Rolling scrape metrics per municipality
+        self._validators: dict[str, dict[str, str]] = {}  # ETag / Last-Modified per municipality
+        self._content_hashes: dict[str, str] = {}
+        self._detail_semaphore = asyncio.Semaphore(detail_concurrency)
+        self._rate_limiter = rate_limiter or TokenBucket(request_rate, request_burst)  # Listing, detail and overview requests alike
+        self.rate_limit_wait = RollingStats()  # Seconds requests waited for the rate limiter
+
+    def _conditional_headers(self, municipality: str) -> dict[str, str]:
+        """Return the revalidation headers for the first page of a municipality."""
+        validators = self._validators.get(municipality, {})
+        headers = {}
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last_modified" in validators:
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    def validator_snapshot(self, municipality: str) -> dict:
+        """Return the cache validators and content hash of a municipality for persisting."""
+        return {
+            "validators": self._validators.get(municipality, {}),
+            "content_hash": self._content_hashes.get(municipality),
+        }
+
+    def restore_validators(self, municipality: str, snapshot: dict) -> None:
+        """Restore validators saved by validator_snapshot, unless newer ones are known."""
+        if municipality in self._validators:
+            return
+        self._validators[municipality] = dict(snapshot.get("validators") or {})
+        if snapshot.get("content_hash"):
+            self._content_hashes[municipality] = snapshot["content_hash"]
+
+    def _store_validators(self, municipality: str, response: aiohttp.ClientResponse) -> None:
+        """Remember the cache validators sent with a response."""
+        validators = {}
+        if etag := response.headers.get("ETag"):
+            validators["etag"] = etag
+        if last_modified := response.headers.get("Last-Modified"):
+            validators["last_modified"] = last_modified
+        self._validators[municipality] = validators
+
+    async def _async_throttle(self) -> None:
+        """Wait until the rate limit allows the next request."""
+        self.rate_limit_wait.add(await self._rate_limiter.async_acquire())
+
+    async def _async_parse(self, label: str, parse_func, *args):
+        """Run a parser function in the executor so the event loop stays responsive."""
+        loop = asyncio.get_running_loop()
+        queued = time.perf_counter()
+        await self._parse_semaphore.acquire()
+        started = time.perf_counter()
+        future = loop.run_in_executor(None, timed_call, parse_func, *args)
+
+        def release(done: asyncio.Future) -> None:
+            # A thread that outlives its timeout keeps its slot until it finishes
+            self._parse_semaphore.release()
+            if not done.cancelled():
+                done.exception()  # Retrieved, so a parse nobody waits for any more does not log an error
+
+        future.add_done_callback(release)
+        try:
+            # Shielded so a timeout stops the wait, not the future the slot is tied to
+            result, parse_seconds = await asyncio.wait_for(asyncio.shield(future), self._parse_timeout)
+        except asyncio.TimeoutError as err:
+            raise PlanviewerApiDataError(f"Parsing the page of {label} took longer than {self._parse_timeout}s") from err
+        finished = time.perf_counter()
+
+        # parse_seconds is how long the event loop would have been blocked by parsing inline
+        self.last_parse_stats[label] = {
+            "parse_seconds": parse_seconds,
+            "executor_seconds": finished - started,
+            "queue_seconds": started - queued,
+        }
+        _LOGGER.debug(
+            f"Parsed {label} in executor: {parse_seconds * 1000:.1f} ms kept off the event loop, "
+            f"{(finished - started) * 1000:.1f} ms in executor, {(started - queued) * 1000:.1f} ms queued"
+        )
+        return result
+
+    async def _async_fetch_listing(self, municipality: str, page: int = 1, conditional: bool = False) -> list[Announcement] | None:
+        """Fetch and parse one listing page of a municipality.
 
-    async def async_scrape_data(self, municipality: str) -> list[dict] | None:
-        """Scrape the latest announcements from Planviewer for the given municipality."""
-        base_url = "https://www.planviewer.nl"  # Include the base URL here
-        municipality_url = f"{base_url}/lb/overheid/{municipality}"
-        announcements_data = []
+        Returns None when a conditional request for the first page finds it
+        unchanged since the last successful parse.
+        """
+        municipality_url = f"{self._base_url}/lb/overheid/{municipality}"
+        page_url = municipality_url if page == 1 else f"{municipality_url}?{PAGE_PARAM}={page}"
         headers = {"User-Agent": "HomeAssistant Planviewer Integration"}  # Be a good citizen
+        if conditional:
+            headers.update(self._conditional_headers(municipality))
+        metrics = self.metrics.setdefault(municipality, ScrapeMetrics())
+        metrics.requests += 1
 
         try:
-            async with self._session.get(municipality_url, headers=headers) as response:
+            await self._async_throttle()
+            requested = time.perf_counter()
+            async with self._session.get(page_url, headers=headers) as response:
+                headers_received = time.perf_counter()
+                metrics.phases["ttfb"].add(headers_received - requested)
                 if response.status == 404:
+                    if page > 1:
+                        return []  # Walked past the last page
                     raise PlanviewerApiNotFoundError(f"Municipality page not found: {municipality_url}")
+                if response.status == 304 and conditional:
+                    _LOGGER.debug(f"Page not modified: {page_url}")
+                    metrics.not_modified += 1
+                    metrics.fetch.add(headers_received - requested)
+                    return None
                 response.raise_for_status()  # Raise an exception for bad status codes
+                if page == 1:
+                    self._store_validators(municipality, response)
+                body = await response.read()
+                html = await response.text()  # Decodes the body read above
+            downloaded = time.perf_counter()
+            metrics.phases["download"].add(downloaded - headers_received)
+            metrics.fetch.add(downloaded - requested)
+            metrics.response_bytes.add(len(body))
+
+            # The connection is released before the CPU-bound work below
+            content_hash = container_fingerprint(html)
+            if conditional and self._content_hashes.get(municipality) == content_hash:
+                _LOGGER.debug(f"Announcement container unchanged, skipping parse for {page_url}")
+                metrics.content_unchanged += 1
+                return None
+
+            timings: dict[str, float] = {}
+            announcements_data = await self._async_parse(municipality, parse_announcements, html, self._parser, timings, municipality)
+            for phase in ("parse", "extract"):
+                if phase in timings:
+                    metrics.phases[phase].add(timings[phase])
+            metrics.items.add(len(announcements_data or ()))
+            if announcements_data is None:
+                _LOGGER.warning(f"Could not find announcement container on {page_url}")
+                return []
+            if not announcements_data:
+                _LOGGER.info(f"No announcements found on {page_url} using specific selector.")
+            if page == 1:
+                self._content_hashes[municipality] = content_hash
+            return announcements_data
+
+        except PlanviewerApiClientError:
+            raise
+        except aiohttp.ClientError as err:
+            raise PlanviewerApiConnectionError(f"Error connecting to Planviewer: {err}") from err
+        except asyncio.TimeoutError as err:
+            raise PlanviewerApiConnectionError(f"Timeout connecting to Planviewer: {page_url}") from err
+        except Exception as err:
+            raise PlanviewerApiDataError(f"Error while scraping data: {err}") from err
+
+    async def async_scrape_data(self, municipality: str) -> list[Announcement]:
+        """Scrape all announcements on the first listing page of the given municipality."""
+        return await self._async_fetch_listing(municipality)
+
+    async def async_crawl(self, municipality: str, cursor: str | None, max_pages: int) -> list[Announcement]:
+        """Walk the listing pages newest-first and return announcements newer than the cursor.
+
+        The cursor is the link of the newest announcement seen on the previous
+        run. Without a cursor up to max_pages pages are backfilled; with one the
+        walk stops as soon as it is reached, which in steady state is on the
+        first page (or before parsing it, when that page is unchanged).
+
+        A page failing after the first one ends a backfill with what it has.
+        With a cursor the error is raised instead, as storing only the newer
+        pages would move the cursor past the announcements in between; the
+        next crawl starts again from the old cursor.
+        """
+        new_items: list[Announcement] = []
+        previous_first_link = None
+        for page in range(1, max_pages + 1):
+            try:
+                items = await self._async_fetch_listing(municipality, page, conditional=page == 1 and cursor is not None)
+            except PlanviewerApiClientError as err:
+                if page == 1:
+                    raise
+                if cursor is not None:
+                    # The first page must not count as unchanged next time, or the crawl would stop there
+                    self._validators.pop(municipality, None)
+                    self._content_hashes.pop(municipality, None)
+                    raise
+                _LOGGER.warning(f"Stopping backfill of {municipality} at page {page}: {err}")
+                break
+            if items is None:
+                break
+            # Some sites repeat the last page for out-of-range page numbers
+            if not items or items[0].link == previous_first_link:
+                break
+            previous_first_link = items[0].link
+            for item in items:
+                if item.link == cursor:
+                    return new_items
+                new_items.append(item)
+        return new_items
+
+    async def async_fetch_municipalities(self) -> dict[str, str]:
+        """Fetch the municipality overview page and return the display name per municipality slug."""
+        overview_url = f"{self._base_url}/lb/overheid"
+        headers = {"User-Agent": "HomeAssistant Planviewer Integration"}  # Be a good citizen
+        try:
+            await self._async_throttle()
+            async with self._session.get(overview_url, headers=headers) as response:
+                response.raise_for_status()
                 html = await response.text()
-                soup = BeautifulSoup(html, "lxml")
-
-                announcement_container = soup.select_one("div.container > div:nth-child(6) > div.col-12.imro-address-list-page > div")
-                if not announcement_container:
-                    _LOGGER.warning(f"Could not find announcement container on {municipality_url}")
-                    return []
-
-                # Select 'a' tags that contain the specific span for the message
-                announcement_items = announcement_container.select("a:has(div > span.col-10.col-sm-6.col-md-7.tbl-btm-row-icon-col)")
-
-                if not announcement_items:
-                    _LOGGER.info(f"No announcements found on {municipality_url} using specific selector.")
-                    return []
-
-                for item in announcement_items:
-                    title_element = item.select_one("div > span.col-10.col-sm-6.col-md-7.tbl-btm-row-icon-col")
-                    date_start_element = item.select_one("div > span:nth-child(2)")
-                    date_end_element = item.select_one("div > span:nth-child(3)")
-                    relative_link = item.get("href")
-                    link = f"{base_url}{relative_link}"
-
-                    full_message = ""
-                    start_date = None  # Initialize start_date here
-                    try:
-                        slug_parts = relative_link.split('/')
-                        if len(slug_parts) > 1:
-                            full_message_slug = slug_parts[-1]
-                            full_message = full_message_slug.replace('-', ' ').strip()
-                        else:
-                            full_message = title_element.text.strip() if title_element else "Announcement"
-                    except Exception as err:
-                        _LOGGER.warning(f"Error extracting full message from link: {link} - {err}")
-                        full_message = title_element.text.strip() if title_element else "Announcement"
-
-                    date_start_str = date_start_element.text.strip() if date_start_element else None
-                    date_end_str = date_end_element.text.strip() if date_end_element else None
-
-                    if date_start_str:
-                        try:
-                            start_date = datetime.strptime(date_start_str, "%d-%m-%Y")
-                        except ValueError:
-                            _LOGGER.warning(f"Could not parse start date: {date_start_str}")
-
-                    if title_element and relative_link:
-                        date_end = date_end_str
-
-                        announcement_data = {
-                            "vergunning": full_message,  # Use the full message from the link
-                            "datum_start": start_date,
-                            "datum_eind": date_end,
-                            "link": link,
-                        }
-                        announcements_data.append(announcement_data)
-                    else:
-                        _LOGGER.debug(f"Skipping item without expected elements: {item}")
-
-                # Limit to the last 3 announcements
-                announcements_data = announcements_data[:3]
-
-                return announcements_data
+            municipalities = await self._async_parse("municipalities", parse_municipalities, html)
+        except PlanviewerApiClientError:
+            raise
+        except aiohttp.ClientError as err:
+            raise PlanviewerApiConnectionError(f"Error connecting to Planviewer: {err}") from err
+        except asyncio.TimeoutError as err:
+            raise PlanviewerApiConnectionError(f"Timeout connecting to Planviewer: {overview_url}") from err
+        except Exception as err:
+            raise PlanviewerApiDataError(f"Error while reading the municipality overview: {err}") from err
+        if not municipalities:
+            raise PlanviewerApiDataError(f"No municipalities found on {overview_url}")
+        return municipalities
 
+    async def async_fetch_details(self, link: str) -> dict[str, str | float]:
+        """Fetch the detail page of an announcement and return the extracted fields."""
+        headers = {"User-Agent": "HomeAssistant Planviewer Integration"}  # Be a good citizen
+        try:
+            async with self._detail_semaphore:
+                await self._async_throttle()
+                async with self._session.get(link, headers=headers) as response:
+                    if response.status == 404:
+                        raise PlanviewerApiNotFoundError(f"Announcement page not found: {link}")
+                    response.raise_for_status()
+                    html = await response.text()
+            return await self._async_parse("details", parse_detail, html)
+        except PlanviewerApiClientError:
+            raise
         except aiohttp.ClientError as err:
             raise PlanviewerApiConnectionError(f"Error connecting to Planviewer: {err}") from err
+        except asyncio.TimeoutError as err:
+            raise PlanviewerApiConnectionError(f"Timeout connecting to Planviewer: {link}") from err
         except Exception as err:
-            raise PlanviewerApiDataError(f"Error while scraping data: {err}") from err
\ No newline at end of file
+            raise PlanviewerApiDataError(f"Error while reading announcement page {link}: {err}") from err
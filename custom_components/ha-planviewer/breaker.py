@@ -0,0 +1,108 @@
+"""Circuit breaker guarding the requests for one municipality."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from enum import StrEnum
+
+from .api import PlanviewerApiClientError
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_OPEN_DELAY,
+    BREAKER_MAX_DELAY,
+    BREAKER_NOT_FOUND_DELAY,
+    BREAKER_NOT_FOUND_MAX_DELAY,
+)
+
+class CircuitState(StrEnum):
+    """States of a circuit breaker."""
+
+    CLOSED = "closed"  # Requests flow, failures are counted
+    OPEN = "open"  # No requests until the retry time
+    HALF_OPEN = "half_open"  # One probe request decides whether to close or open again
+
+class FailureKind(StrEnum):
+    """Why a breaker opened."""
+
+    NOT_FOUND = "not_found"  # The municipality page does not exist, likely a misspelled slug
+    TRANSIENT = "transient"  # Connection errors, timeouts and server errors
+
+class PlanviewerCircuitOpenError(PlanviewerApiClientError):
+    """Exception for a request skipped because the breaker of its municipality is open."""
+
+    def __init__(self, municipality: str, retry_at: datetime | None) -> None:
+        """Initialize the error."""
+        super().__init__(f"Requests for {municipality} are paused until {retry_at}")
+        self.retry_at = retry_at
+
+class CircuitBreaker:
+    """Stop requesting a municipality that keeps failing, and probe it with growing delays.
+
+    A missing page opens the breaker at once and is probed rarely, as it only
+    comes back when the slug is fixed. Transient errors open it after
+    BREAKER_FAILURE_THRESHOLD failures in a row. Every probe that fails doubles
+    the delay until the next one, up to a maximum per kind.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a closed breaker."""
+        self.state = CircuitState.CLOSED
+        self.failures = 0  # Consecutive failures
+        self.kind: FailureKind | None = None  # Kind of the last failure
+        self.trips = 0  # Times opened since the last success, drives the delay
+        self.opened_at: datetime | None = None
+        self.retry_at: datetime | None = None
+
+    def allow_request(self, now: datetime) -> bool:
+        """Return True if a request may go out, turning an expired open breaker half-open."""
+        if self.state == CircuitState.OPEN and self.retry_at is not None and now >= self.retry_at:
+            self.state = CircuitState.HALF_OPEN
+        return self.state != CircuitState.OPEN
+
+    def record_success(self) -> bool:
+        """Close the breaker after a successful request; return True if it was not closed."""
+        changed = self.state != CircuitState.CLOSED
+        self.state = CircuitState.CLOSED
+        self.failures = self.trips = 0
+        self.kind = self.opened_at = self.retry_at = None
+        return changed
+
+    def record_failure(self, kind: FailureKind, now: datetime) -> bool:
+        """Count a failed request; return True if it opened the breaker."""
+        self.failures += 1
+        self.kind = kind
+        if (
+            self.state == CircuitState.CLOSED
+            and kind == FailureKind.TRANSIENT
+            and self.failures < BREAKER_FAILURE_THRESHOLD
+        ):
+            return False
+
+        self.trips += 1
+        if kind == FailureKind.NOT_FOUND:
+            base, maximum = BREAKER_NOT_FOUND_DELAY, BREAKER_NOT_FOUND_MAX_DELAY
+        else:
+            base, maximum = BREAKER_OPEN_DELAY, BREAKER_MAX_DELAY
+        self.state = CircuitState.OPEN
+        self.opened_at = self.opened_at or now
+        self.retry_at = now + timedelta(seconds=min(base * 2 ** (self.trips - 1), maximum))
+        return True
+
+    def as_dict(self) -> dict:
+        """Return the breaker in a form that can be persisted."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "kind": self.kind,
+            "trips": self.trips,
+            "opened_at": self.opened_at.isoformat() if self.opened_at else None,
+            "retry_at": self.retry_at.isoformat() if self.retry_at else None,
+        }
+
+    def restore(self, data: dict) -> None:
+        """Replace the state with a persisted one."""
+        self.state = CircuitState(data.get("state", CircuitState.CLOSED))
+        self.failures = data.get("failures", 0)
+        self.kind = FailureKind(data["kind"]) if data.get("kind") else None
+        self.trips = data.get("trips", 0)
+        self.opened_at = datetime.fromisoformat(data["opened_at"]) if data.get("opened_at") else None
+        self.retry_at = datetime.fromisoformat(data["retry_at"]) if data.get("retry_at") else None
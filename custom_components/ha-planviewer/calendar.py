@@ -0,0 +1,136 @@
+"""Calendar platform for Planviewer integration."""
+
+import logging
+from datetime import date, datetime, time, timedelta
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .api import announcement_id
+from .const import DOMAIN, CONF_INSTANCE_NAME, SIGNAL_POLL_FINISHED
+from .coordinator import PlanviewerDataUpdateCoordinator
+from .entity import PlanviewerStateWriteMixin
+from .models import Announcement
+from .periods import announcement_span
+
+_LOGGER = logging.getLogger(__name__)
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the Planviewer calendar from config entry."""
+    coordinator: PlanviewerDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities([PlanviewerCalendar(coordinator, entry.data[CONF_INSTANCE_NAME])])
+
+def announcement_event(announcement: Announcement) -> CalendarEvent:
+    """Return an announcement as an all-day event running from its start date through its end date."""
+    start, end = announcement_span(announcement)
+    return CalendarEvent(
+        start=start,
+        end=end,
+        summary=announcement.vergunning,
+        description="\n\n".join(text for text in (announcement.omschrijving, announcement.link) if text),
+        location=announcement.adres,
+        uid=announcement_id(announcement.link),
+    )
+
+class PlanviewerCalendar(PlanviewerStateWriteMixin, CoordinatorEntity[PlanviewerDataUpdateCoordinator], CalendarEntity):
+    """The announcements of an entry, across its whole stored history, as calendar events.
+
+    Events come from the interval index of every municipality history and pass
+    the zone and keyword filters of the entry, like the announcement sensors.
+    """
+
+    _attr_has_entity_name = False
+    _unrecorded_attributes = frozenset({"location"})  # The full address, fixed per announcement
+    _event: CalendarEvent | None = None
+
+    def __init__(self, coordinator: PlanviewerDataUpdateCoordinator, instance_name: str) -> None:
+        """Initialize the calendar."""
+        super().__init__(coordinator)
+        self._instance_name = instance_name
+        self._attr_unique_id = f"{DOMAIN}_{coordinator.config_entry.entry_id}_calendar"
+        self._attr_name = f"{instance_name} Announcements"
+
+    @property
+    def device_info(self) -> dict:
+        """Return the device info."""
+        return {
+            "identifiers": {
+                (DOMAIN, self._instance_name),
+            },
+            "name": f"Planviewer ({self._instance_name})",
+            "manufacturer": "Planviewer",
+            "model": "Announcement Calendar",
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Also update after polls that did not change the exposed announcements, as the history may have."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_POLL_FINISHED.format(self.coordinator.config_entry.entry_id),
+                self.async_write_ha_state_if_changed,
+            )
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the current or next event changed."""
+        self.async_write_ha_state_if_changed()
+
+    def state_fingerprint(self) -> CalendarEvent | None:
+        """Look up the current or next event; its start and end are also when the state turns on and off.
+
+        The event is kept for the state, the attributes and the timer of the
+        write that follows, so it is looked up once per update.
+        """
+        self._event = self._current_event()
+        return self._event
+
+    def _running(self, start: date, end: date) -> list[Announcement]:
+        """Return the announcements of the entry running on any day from start up to end, ordered by start date."""
+        announcements = []
+        for municipality in self.coordinator.municipalities:
+            history = self.coordinator.hub.history(municipality)
+            announcements.extend(history.running(start, end, self.coordinator.matching_links(history)))
+        announcements.sort(key=lambda announcement: announcement.datum_start)
+        return announcements
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the event found by the last state_fingerprint call."""
+        return self._event
+
+    def _current_event(self) -> CalendarEvent | None:
+        """Return the earliest started announcement running today, or else the next one to start."""
+        today = dt_util.now().date()
+        if running := self._running(today, today + timedelta(days=1)):
+            return announcement_event(running[0])
+        upcoming = None
+        for municipality in self.coordinator.municipalities:
+            history = self.coordinator.hub.history(municipality)
+            links = self.coordinator.matching_links(history)
+            for link in history.periods.starting_from(today):
+                if links is None or link in links:
+                    announcement = history.announcement(link)
+                    if upcoming is None or announcement.datum_start < upcoming.datum_start:
+                        upcoming = announcement
+                    break
+        return announcement_event(upcoming) if upcoming else None
+
+    async def async_get_events(self, hass: HomeAssistant, start_date: datetime, end_date: datetime) -> list[CalendarEvent]:
+        """Return the announcements running between two moments."""
+        start = dt_util.as_local(start_date).date()
+        local_end = dt_util.as_local(end_date)
+        # The end is exclusive, so a range ending at midnight leaves out that day
+        end = local_end.date() if local_end.time() == time.min else local_end.date() + timedelta(days=1)
+        return [announcement_event(announcement) for announcement in self._running(start, end)]
@@ -0,0 +1,148 @@
+"""Catalog of the municipalities Planviewer has announcement pages for."""
+from __future__ import annotations
+
+import asyncio
+import difflib
+import json
+import logging
+import re
+import unicodedata
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import PlanviewerApiClient, PlanviewerApiClientError
+from .const import (
+    STORAGE_VERSION,
+    CATALOG_STORAGE_KEY,
+    CATALOG_TTL_DAYS,
+    CATALOG_RETRY_INTERVAL,
+    CATALOG_FETCH_TIMEOUT,
+    DATA_CATALOG,
+)
+from .transport import async_get_transport
+
+_LOGGER = logging.getLogger(__name__)
+
+SNAPSHOT_PATH = Path(__file__).parent / "municipalities.json"  # Bundled catalog for when Planviewer is unreachable
+SLUG_SEPARATOR_PATTERN = re.compile(r"[^a-z0-9]+")
+FUZZY_CUTOFF = 0.6  # Minimum similarity of a suggestion to a misspelled name
+
+def municipality_slug(text: str) -> str:
+    """Return the slug form of a municipality name, as used in the Planviewer address ("Súdwest-Fryslân" to "sudwest-fryslan")."""
+    decomposed = unicodedata.normalize("NFKD", text.strip().lower().replace("'", ""))
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return SLUG_SEPARATOR_PATTERN.sub("-", folded).strip("-")
+
+class MunicipalityCatalog:
+    """Municipality slugs with their display names, indexed for prefix and fuzzy lookups.
+
+    Every municipality is found by the slug form of both its slug and its name,
+    so "Den Haag", "den haag" and "den-haag" resolve alike. Prefix lookups
+    bisect a sorted key list; fuzzy lookups only run when no prefix matches.
+    """
+
+    def __init__(self, names: dict[str, str], complete: bool, fetched_at: datetime | None = None) -> None:
+        """Initialize the catalog.
+
+        complete is True for a list downloaded from Planviewer, which rules out
+        any municipality it does not hold; the bundled snapshot may be outdated.
+        """
+        self.names = names
+        self.complete = complete
+        self.fetched_at = fetched_at
+        self.expires_at: datetime | None = None  # When to download the catalog again
+        self._slugs_by_key: dict[str, str] = {}
+        for slug, name in names.items():
+            self._slugs_by_key.setdefault(municipality_slug(slug), slug)
+            self._slugs_by_key.setdefault(municipality_slug(name), slug)
+        self._keys = sorted(self._slugs_by_key)
+
+    def __len__(self) -> int:
+        """Return the number of municipalities."""
+        return len(self.names)
+
+    def __contains__(self, slug: str) -> bool:
+        """Return True if the catalog holds the slug."""
+        return slug in self.names
+
+    def resolve(self, text: str) -> str | None:
+        """Return the slug of a municipality given by slug or name, or None if it is unknown."""
+        return self._slugs_by_key.get(municipality_slug(text))
+
+    def suggest(self, text: str, limit: int = 5) -> list[str]:
+        """Return the slugs of the municipalities whose slug or name starts like the text, or else resembles it."""
+        key = municipality_slug(text)
+        if not key:
+            return []
+        slugs: list[str] = []
+        for index in range(bisect_left(self._keys, key), len(self._keys)):
+            if not self._keys[index].startswith(key) or len(slugs) == limit:
+                break
+            if (slug := self._slugs_by_key[self._keys[index]]) not in slugs:
+                slugs.append(slug)
+        if not slugs:
+            for match in difflib.get_close_matches(key, self._keys, n=limit, cutoff=FUZZY_CUTOFF):
+                if (slug := self._slugs_by_key[match]) not in slugs:
+                    slugs.append(slug)
+        return slugs
+
+    def options(self) -> list[tuple[str, str]]:
+        """Return (slug, name) pairs ordered by name, for a selector."""
+        return sorted(self.names.items(), key=lambda item: municipality_slug(item[1]))
+
+    def as_dict(self) -> dict:
+        """Return the catalog in a form that can be persisted."""
+        return {
+            "fetched_at": self.fetched_at.isoformat() if self.fetched_at else None,
+            "municipalities": self.names,
+        }
+
+def _load_snapshot() -> dict[str, str]:
+    """Read the bundled municipality snapshot."""
+    with SNAPSHOT_PATH.open(encoding="utf-8") as file:
+        return json.load(file)["municipalities"]
+
+async def async_get_catalog(hass: HomeAssistant) -> MunicipalityCatalog:
+    """Return the municipality catalog without waiting for Planviewer.
+
+    The first call reads the download cached on disk, or else the bundled
+    snapshot. Once the catalog is older than CATALOG_TTL_DAYS, or when it is
+    the snapshot, a download starts in the background and replaces it when it
+    succeeds. A failed download is tried again after CATALOG_RETRY_INTERVAL.
+    """
+    now = dt_util.utcnow()
+    catalog: MunicipalityCatalog | None = hass.data.get(DATA_CATALOG)
+    if catalog is None:
+        if stored := await Store(hass, STORAGE_VERSION, CATALOG_STORAGE_KEY).async_load():
+            catalog = MunicipalityCatalog(stored["municipalities"], True, datetime.fromisoformat(stored["fetched_at"]))
+            catalog.expires_at = catalog.fetched_at + timedelta(days=CATALOG_TTL_DAYS)
+        else:
+            catalog = MunicipalityCatalog(await hass.async_add_executor_job(_load_snapshot), False)
+        hass.data[DATA_CATALOG] = catalog
+
+    if catalog.expires_at is None or now >= catalog.expires_at:
+        # Not due again while the download runs, nor for a while after it fails
+        catalog.expires_at = now + timedelta(seconds=CATALOG_RETRY_INTERVAL)
+        hass.async_create_background_task(_async_download_catalog(hass), "planviewer municipality catalog download")
+    return catalog
+
+async def _async_download_catalog(hass: HomeAssistant) -> None:
+    """Download the municipality catalog, use it from now on and cache it on disk."""
+    now = dt_util.utcnow()
+    try:
+        async with asyncio.timeout(CATALOG_FETCH_TIMEOUT):
+            session, _, rate_limiter = async_get_transport(hass)
+            names = await PlanviewerApiClient(session, rate_limiter=rate_limiter).async_fetch_municipalities()
+    except (PlanviewerApiClientError, TimeoutError) as err:
+        _LOGGER.warning("Could not download the Planviewer municipality list, using a cached copy: %s", err)
+        return
+    catalog = MunicipalityCatalog(names, True, now)
+    catalog.expires_at = now + timedelta(days=CATALOG_TTL_DAYS)
+    hass.data[DATA_CATALOG] = catalog
+    await Store(hass, STORAGE_VERSION, CATALOG_STORAGE_KEY).async_save(catalog.as_dict())
+    _LOGGER.debug("Downloaded %d Planviewer municipalities", len(catalog))
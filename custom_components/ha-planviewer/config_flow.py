@@ -3,79 +3,179 @@ import logging
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-
-from .const import DOMAIN, CONF_MUNICIPALITY, CONF_INSTANCE_NAME, CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+from homeassistant.helpers.selector import (
+    EntitySelector,
+    EntitySelectorConfig,
+    SelectOptionDict,
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
+)
+
+from .catalog import MunicipalityCatalog, async_get_catalog, municipality_slug
+from .const import (
+    DOMAIN,
+    CONF_MUNICIPALITIES,
+    CONF_INSTANCE_NAME,
+    CONF_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    CONF_MAX_ANNOUNCEMENTS,
+    DEFAULT_MAX_ANNOUNCEMENTS,
+    CONF_BACKFILL_PAGES,
+    DEFAULT_BACKFILL_PAGES,
+    CONF_ENRICH_DETAILS,
+    CONF_ZONES,
+    CONF_KEYWORDS,
+    CONF_FETCH_CONCURRENCY,
+    DEFAULT_FETCH_CONCURRENCY,
+)
+from .coordinator import entry_municipalities
 
 _LOGGER = logging.getLogger(__name__)
 
 MIN_SCAN_INTERVAL_SECONDS = 300 # 5 minutes
 
-async def validate_municipality(hass: HomeAssistant, municipality: str) -> bool:
-    """Validate if the municipality is likely valid (basic check)."""
-    # For now, we'll just check if it's not empty. More sophisticated checks
-    # might involve trying to access the Planviewer page for this municipality.
-    return bool(municipality.strip())
+def validate_municipality(catalog: MunicipalityCatalog, municipality: str, confirmed: bool = False) -> str | None:
+    """Return the Planviewer slug of a municipality given by slug or name, or None if it is not valid.
+
+    The bundled snapshot may miss a renamed or merged municipality, so only a
+    downloaded list rules a name out. Against the snapshot, a name it does not
+    hold is only taken once confirmed by submitting it again.
+    """
+    if slug := catalog.resolve(municipality):
+        return slug
+    if not catalog.complete and confirmed:
+        return municipality_slug(municipality) or None
+    return None
+
+def municipality_selector(catalog: MunicipalityCatalog) -> SelectSelector:
+    """Return a searchable municipality dropdown that still accepts a slug missing from the catalog."""
+    return SelectSelector(SelectSelectorConfig(
+        options=[SelectOptionDict(value=slug, label=name) for slug, name in catalog.options()],
+        multiple=True,
+        custom_value=True,
+        mode=SelectSelectorMode.DROPDOWN,
+    ))
 
 def validate_scan_interval(scan_interval: int) -> bool:
     """Validate if the scan interval meets the minimum requirement."""
     return scan_interval >= MIN_SCAN_INTERVAL_SECONDS
 
+def options_schema(options: dict) -> vol.Schema:
+    """Return the options schema with the current values as defaults."""
+    return vol.Schema({
+        vol.Required(
+            CONF_SCAN_INTERVAL,
+            default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        ): int,
+        vol.Required(
+            CONF_MAX_ANNOUNCEMENTS,
+            default=options.get(CONF_MAX_ANNOUNCEMENTS, DEFAULT_MAX_ANNOUNCEMENTS)
+        ): vol.All(int, vol.Range(min=1, max=50)),
+        vol.Required(
+            CONF_BACKFILL_PAGES,
+            default=options.get(CONF_BACKFILL_PAGES, DEFAULT_BACKFILL_PAGES)
+        ): vol.All(int, vol.Range(min=1, max=100)),
+        vol.Required(
+            CONF_ENRICH_DETAILS,
+            default=options.get(CONF_ENRICH_DETAILS, False)
+        ): bool,
+        vol.Optional(
+            CONF_ZONES,
+            default=options.get(CONF_ZONES, [])
+        ): EntitySelector(EntitySelectorConfig(domain="zone", multiple=True)),
+        vol.Optional(
+            CONF_KEYWORDS,
+            default=options.get(CONF_KEYWORDS, "")
+        ): str,
+        vol.Required(
+            CONF_FETCH_CONCURRENCY,
+            default=options.get(CONF_FETCH_CONCURRENCY, DEFAULT_FETCH_CONCURRENCY)
+        ): vol.All(int, vol.Range(min=1, max=10)),
+    })
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Config flow for Planviewer."""
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._unverified_municipalities: set[str] = set()  # Names not in the offline snapshot, taken when submitted again
+
     async def async_step_user(self, user_input=None) -> FlowResult:
         """Handle the initial step."""
         errors = {}
+        placeholders = {"municipality": "", "suggestions": ""}
+        catalog = await async_get_catalog(self.hass)
         if user_input is not None:
-            municipality = user_input.get(CONF_MUNICIPALITY)
+            municipalities = user_input.get(CONF_MUNICIPALITIES) or []
             instance_name = user_input.get(CONF_INSTANCE_NAME)
             scan_interval = user_input.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL) # Get scan interval
 
-            if not municipality:
-                errors[CONF_MUNICIPALITY] = "required"
+            if not municipalities:
+                errors[CONF_MUNICIPALITIES] = "required"
             if not instance_name:
                 errors[CONF_INSTANCE_NAME] = "required"
             if not validate_scan_interval(scan_interval): # Validate scan interval
                  errors[CONF_SCAN_INTERVAL] = "invalid_scan_interval"
 
+            slugs: list[str] = []
+            for municipality in municipalities if not errors else []:
+                confirmed = municipality in self._unverified_municipalities
+                if (slug := validate_municipality(catalog, municipality, confirmed)) is not None:
+                    if slug not in slugs:
+                        slugs.append(slug)
+                    continue
+                # Report the first municipality that is not valid
+                placeholders["municipality"] = municipality
+                if not catalog.complete:
+                    if suggestions := catalog.suggest(municipality):
+                        errors[CONF_MUNICIPALITIES] = "unverified_municipality_suggestions"
+                        placeholders["suggestions"] = ", ".join(catalog.names[suggestion] for suggestion in suggestions)
+                    else:
+                        errors[CONF_MUNICIPALITIES] = "unverified_municipality"
+                    self._unverified_municipalities.add(municipality)
+                elif suggestions := catalog.suggest(municipality):
+                    errors[CONF_MUNICIPALITIES] = "invalid_municipality_suggestions"
+                    placeholders["suggestions"] = ", ".join(catalog.names[suggestion] for suggestion in suggestions)
+                else:
+                    errors[CONF_MUNICIPALITIES] = "invalid_municipality"
+                break
+
             if not errors:
                 for entry in self._async_current_entries():
-                    if (entry.data.get(CONF_MUNICIPALITY) == municipality and
+                    if (set(entry_municipalities(entry.data)) == set(slugs) and
                             entry.data.get(CONF_INSTANCE_NAME) == instance_name):
                         return self.async_abort(reason="already_configured")
 
-                if await validate_municipality(self.hass, municipality):
-                    # Store municipality and instance name in data, scan interval in options
-                    return self.async_create_entry(
-                        title=f"Planviewer ({instance_name})",
-                        data={
-                            CONF_MUNICIPALITY: municipality,
-                            CONF_INSTANCE_NAME: instance_name,
-                        },
-                         options={
-                            CONF_SCAN_INTERVAL: scan_interval,
-                        },
-                    )
-                else:
-                    errors["base"] = "invalid_municipality"
+                # Store municipalities and instance name in data, scan interval in options
+                return self.async_create_entry(
+                    title=f"Planviewer ({instance_name})",
+                    data={
+                        CONF_MUNICIPALITIES: slugs,
+                        CONF_INSTANCE_NAME: instance_name,
+                    },
+                     options={
+                        CONF_SCAN_INTERVAL: scan_interval,
+                    },
+                )
 
         # Show form for initial setup
         data_schema = vol.Schema(
             {
-                vol.Required(CONF_MUNICIPALITY): str,
+                vol.Required(CONF_MUNICIPALITIES): municipality_selector(catalog),
                 vol.Required(CONF_INSTANCE_NAME): str, # No default, user must choose
                 vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): int, # Optional with default
             }
         )
         return self.async_show_form(
             step_id="user",
-            data_schema=data_schema,
+            data_schema=self.add_suggested_values_to_schema(data_schema, user_input),
             errors=errors,
+            description_placeholders=placeholders,
         )
 
     @staticmethod
@@ -100,12 +200,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             if not validate_scan_interval(scan_interval): # Validate scan interval
                 return self.async_show_form(
                     step_id="init",
-                    data_schema=vol.Schema({
-                        vol.Required(
-                            CONF_SCAN_INTERVAL,
-                            default=self.config_entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-                        ): int,
-                    }),
+                    data_schema=options_schema(self.config_entry.options),
                     errors={CONF_SCAN_INTERVAL: "invalid_scan_interval"},
                 )
 
@@ -113,14 +208,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             return self.async_create_entry(title="", data=user_input)
 
         # Show the options form
-        options_schema = vol.Schema({
-            vol.Required(
-                CONF_SCAN_INTERVAL,
-                default=self.config_entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-            ): int,
-        })
-
         return self.async_show_form(
             step_id="init",
-            data_schema=options_schema,
+            data_schema=options_schema(self.config_entry.options),
         )
\ No newline at end of file
@@ -1,11 +1,82 @@
 DOMAIN = "planviewer"
 MANUFACTURER = "Planviewer"
 DEFAULT_SCAN_INTERVAL = 3600  # Example: Check every 5 minutes
-CONF_MUNICIPALITY = "municipality"
+CONF_MUNICIPALITY = "municipality"  # Single municipality of entries created before CONF_MUNICIPALITIES
+CONF_MUNICIPALITIES = "municipalities"
 CONF_INSTANCE_NAME = "instance_name"
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_MAX_ANNOUNCEMENTS = "max_announcements"
+CONF_BACKFILL_PAGES = "backfill_pages"
+CONF_ENRICH_DETAILS = "enrich_details"
+CONF_ZONES = "zones"
+CONF_KEYWORDS = "keywords"
+CONF_FETCH_CONCURRENCY = "fetch_concurrency"
 
-PLATFORMS = ["sensor"]
+DEFAULT_MAX_ANNOUNCEMENTS = 3  # Newest announcements exposed as sensors
+DEFAULT_BACKFILL_PAGES = 3  # Listing pages crawled on the first sync
+DEFAULT_HISTORY_SIZE = 500  # Announcements kept per municipality
+DEFAULT_FETCH_CONCURRENCY = 4  # Municipalities of one entry crawled at the same time
+
+PLATFORMS = ["sensor", "calendar"]
+
+DEFAULT_PARSE_CONCURRENCY = 2  # Pages parsed at the same time in the executor
+DEFAULT_PARSE_TIMEOUT = 30  # Seconds before a single page parse is abandoned
+DEFAULT_DETAIL_CONCURRENCY = 4  # Detail pages fetched at the same time
+DEFAULT_REQUEST_RATE = 2.0  # Requests per second to Planviewer, over all entries and detail pages
+DEFAULT_REQUEST_BURST = 8  # Requests that may go out at once before the rate applies
+HTTP_CONNECTION_LIMIT = 10  # Open connections of the Planviewer session
+HTTP_CONNECTIONS_PER_HOST = 6  # Open connections to one host, reused between requests
+HTTP_KEEPALIVE_TIMEOUT = 60  # Seconds an idle connection is kept open for the next request
+HTTP_DNS_CACHE_TTL = 300  # Seconds a resolved host name is cached
+HTTP_CONNECT_TIMEOUT = 10  # Seconds to set up a connection
+HTTP_READ_TIMEOUT = 30  # Seconds without data before a response read fails
+HTTP_TOTAL_TIMEOUT = 60  # Seconds for a whole request, including a queued connection
+DETAIL_CACHE_SIZE = 5000  # Detail pages remembered across restarts
+DETAIL_RETRY_DELAY = 3600  # Seconds before a failed detail page is tried again, doubling per failure
+DETAIL_MAX_ATTEMPTS = 4  # Failed fetches of a detail page before it is given up on
+SEEN_INDEX_SIZE = 2000  # Announcement IDs remembered per municipality to fire events only once
+SEEN_MAX_AGE_DAYS = 365  # Seen announcement IDs are forgotten after this long
+GEO_GRID_CELL = 0.01  # Degrees per spatial index cell, about 1.1 by 0.7 km in the Netherlands
+POSTCODE_FILE = "planviewer_postcodes.csv"  # Optional postcode coordinates, in the configuration directory
+
+MIN_POLL_INTERVAL = 300  # Adaptive polling never goes below this many seconds
+MAX_BACKOFF_INTERVAL = 6 * 3600  # Cap on the error backoff, before jitter
+PUBLICATION_MIN_SAMPLES = 10  # Publications seen before polling adapts to learned windows
+PUBLICATION_WINDOW_SPEEDUP = 4  # Poll this much more often in busy publication slots
+QUIET_WINDOW_SLOWDOWN = 2  # Poll this much less often in slots without publications
+POLL_JITTER = 0.1  # Random spread of +/- 10% on every poll interval
+
+BREAKER_FAILURE_THRESHOLD = 5  # Transient failures in a row before requests for a municipality stop
+BREAKER_OPEN_DELAY = 15 * 60  # Seconds until the first probe after transient failures, doubling per failed probe
+BREAKER_MAX_DELAY = 24 * 3600  # Cap on the probe delay after transient failures
+BREAKER_NOT_FOUND_DELAY = 6 * 3600  # Seconds until the first probe of a missing municipality page
+BREAKER_NOT_FOUND_MAX_DELAY = 7 * 24 * 3600  # Cap on the probe delay of a missing municipality page
+
+METRICS_WINDOW = 100  # Scrapes kept per municipality for percentile metrics
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30  # Seconds to coalesce snapshot writes
+DETAILS_STORAGE_KEY = f"{DOMAIN}.details"
+SEEN_STORAGE_KEY = f"{DOMAIN}.seen"
+BREAKERS_STORAGE_KEY = f"{DOMAIN}.breakers"
+HISTORIES_STORAGE_KEY = f"{DOMAIN}.histories"
+CATALOG_STORAGE_KEY = f"{DOMAIN}.municipalities"
+CATALOG_TTL_DAYS = 30  # Days before the municipality catalog is downloaded again
+CATALOG_RETRY_INTERVAL = 3600  # Seconds before a failed catalog download is tried again
+CATALOG_FETCH_TIMEOUT = 15  # Seconds a catalog download may take
+STARTUP_REFRESH_STAGGER = 5  # Seconds between background refreshes of restored entries
+
+DATA_HUB = "fetch_hub"  # Key of the shared fetch hub in hass.data[DOMAIN]
+DATA_TRANSPORT = f"{DOMAIN}_transport"  # Key of the shared HTTP session, its stats and rate limit in hass.data
+DATA_CATALOG = f"{DOMAIN}_catalog"  # Key of the municipality catalog in hass.data, also used before any entry exists
+DATA_STARTUP_REFRESH = f"{DOMAIN}_startup_refresh"  # Key of the loop time the next restored entry may refresh at in hass.data
+SIGNAL_POLL_FINISHED = f"{DOMAIN}_poll_finished_{{}}"  # Formatted with the entry ID
+SERVICE_SEARCH = "search"
+ATTR_QUERY = "query"
+ATTR_MUNICIPALITY = "municipality"
+ATTR_LIMIT = "limit"
+DEFAULT_SEARCH_LIMIT = 20  # Announcements returned by a search unless asked otherwise
+EVENT_NEW_ANNOUNCEMENT = f"{DOMAIN}_new_announcement"  # Fired once per newly published announcement
 
 SCRAPED_DATA_KEYS = [
     "vergunning",
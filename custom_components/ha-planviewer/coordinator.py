@@ -1,42 +1,91 @@
 """DataUpdateCoordinator for Planviewer."""
 import asyncio
+import time
+from collections.abc import Mapping
 from datetime import timedelta, datetime, timezone
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
 from .api import (
-    PlanviewerApiClient,
     PlanviewerApiConnectionError,
     PlanviewerApiNotFoundError,
 )
-from .const import DOMAIN, DEFAULT_SCAN_INTERVAL, CONF_SCAN_INTERVAL
+from .breaker import CircuitState, PlanviewerCircuitOpenError
+from .const import (
+    DOMAIN,
+    CONF_MUNICIPALITY,
+    CONF_MUNICIPALITIES,
+    DEFAULT_SCAN_INTERVAL,
+    CONF_SCAN_INTERVAL,
+    CONF_MAX_ANNOUNCEMENTS,
+    DEFAULT_MAX_ANNOUNCEMENTS,
+    CONF_BACKFILL_PAGES,
+    DEFAULT_BACKFILL_PAGES,
+    CONF_ENRICH_DETAILS,
+    CONF_ZONES,
+    CONF_KEYWORDS,
+    CONF_FETCH_CONCURRENCY,
+    DEFAULT_FETCH_CONCURRENCY,
+    STORAGE_VERSION,
+    STORAGE_SAVE_DELAY,
+    SIGNAL_POLL_FINISHED,
+)
+from .geo import Zone
+from .history import AnnouncementHistory
+from .hub import PlanviewerFetchHub
+from .metrics import RollingStats
+from .models import Announcement
+from .scheduler import AdaptivePollScheduler
+from .search import SearchQuery
 
 _LOGGER = logging.getLogger(__name__)
 
+def entry_municipalities(data: Mapping) -> list[str]:
+    """Return the municipalities of a config entry, which older entries hold as a single string."""
+    return list(data.get(CONF_MUNICIPALITIES) or [data[CONF_MUNICIPALITY]])
+
 class PlanviewerDataUpdateCoordinator(DataUpdateCoordinator):
-    """DataUpdateCoordinator for Planviewer."""
+    """DataUpdateCoordinator for Planviewer.
+
+    Serves every municipality of its entry in one batch. The data maps each
+    municipality to the announcements exposed for it; a municipality that
+    fails keeps its last announcements without failing the others.
+    """
 
     _last_update_error: Exception | None = None # Instance variable
-    last_data: list[dict] | None = None # Store last successful data
 
-    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry, hub: PlanviewerFetchHub) -> None:
         """Initialize DataUpdateCoordinator."""
-        self.api_client = PlanviewerApiClient(session=hass.helpers.aiohttp_client.async_get_clientsession())
+        self.hub = hub
         self.config_entry = config_entry
-        self.municipality = config_entry.data["municipality"]
+        self.municipalities = entry_municipalities(config_entry.data)
+        self.municipality_errors: dict[str, Exception] = {} # Municipalities that failed on the last poll
         self.last_update_success = False
         self.last_update_success_timestamp: datetime | None = None
         self._error_count = 0
+        self.data_unchanged = False # True when the last poll did not change the exposed announcements
+        self.max_announcements = config_entry.options.get(CONF_MAX_ANNOUNCEMENTS, DEFAULT_MAX_ANNOUNCEMENTS)
+        self.backfill_pages = config_entry.options.get(CONF_BACKFILL_PAGES, DEFAULT_BACKFILL_PAGES)
+        self.enrich_details = config_entry.options.get(CONF_ENRICH_DETAILS, False)
+        self.zones: list[str] = config_entry.options.get(CONF_ZONES, []) # Zone entity IDs, empty for the whole municipality
+        self.keywords = SearchQuery.parse(config_entry.options.get(CONF_KEYWORDS, "")) # Empty for every announcement
+        self.fetch_concurrency = config_entry.options.get(CONF_FETCH_CONCURRENCY, DEFAULT_FETCH_CONCURRENCY)
+        self._store: Store[dict] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{config_entry.entry_id}")
         scan_interval_seconds = config_entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        self.scheduler = AdaptivePollScheduler(timedelta(seconds=scan_interval_seconds))
+        self.refresh_stats = RollingStats() # Seconds per refresh, including waiting on a shared fetch
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
             update_interval=timedelta(seconds=scan_interval_seconds), # Use the value from options
+            always_update=False, # Only wake listeners when the data actually changed
         )
 
     @property
@@ -49,32 +98,184 @@ class PlanviewerDataUpdateCoordinator(DataUpdateCoordinator):
         """Return the last update error."""
         return self._last_update_error
 
-    async def _async_update_data(self) -> list[dict] | None:
-        """Update data via library."""
-        _LOGGER.debug("Fetching Planviewer data for %s", self.municipality)
+    @property
+    def partial_failure(self) -> bool:
+        """Return True if some, but not all, municipalities failed on the last poll."""
+        return bool(self.municipality_errors) and len(self.municipality_errors) < len(self.municipalities)
+
+    @property
+    def next_poll(self) -> datetime | None:
+        """Return when the adaptive scheduler plans the next poll."""
+        return self.scheduler.next_poll
+
+    def zone_areas(self) -> list[Zone]:
+        """Return the center and radius of every configured zone that exists."""
+        areas = []
+        for entity_id in self.zones:
+            state = self.hass.states.get(entity_id)
+            if state is None or state.attributes.get("latitude") is None:
+                _LOGGER.debug("Zone %s of %s not found, ignoring it", entity_id, self.config_entry.entry_id)
+                continue
+            areas.append((state.attributes["latitude"], state.attributes["longitude"], state.attributes.get("radius", 0)))
+        return areas
+
+    def matching_links(self, history: AnnouncementHistory) -> set[str] | None:
+        """Return the links of the announcements inside the zones and matching the keywords of this entry.
+
+        Returns None when the entry has neither, so it takes every announcement.
+        """
+        links = None
+        if self.zones:
+            links = history.locations.within_any(self.zone_areas())
+        if self.keywords:
+            matches = history.terms.search(self.keywords)
+            links = matches if links is None else links & matches
+        return links
+
+    def select(self, history: AnnouncementHistory) -> list[Announcement]:
+        """Return the announcements this entry exposes: the newest ones that pass its filters."""
+        links = self.matching_links(history)
+        if links is None:
+            return history.latest(self.max_announcements)
+        return history.latest_matching(self.max_announcements, links)
+
+    @callback
+    def _async_plan_next_poll(self) -> None:
+        """Let the scheduler pick the next interval and tell the diagnostic sensors."""
+        breakers = [self.hub.breaker(municipality) for municipality in self.municipalities]
+        not_before = None
+        if all(breaker.state == CircuitState.OPEN for breaker in breakers):
+            not_before = min(breaker.retry_at for breaker in breakers) # Sleep through paused municipalities
+        self.update_interval = self.scheduler.next_interval(
+            dt_util.now(),
+            [sum(slot) for slot in zip(*(self.hub.history(municipality).publication_counts for municipality in self.municipalities))],
+            self._error_count,
+            not_before,
+        )
+        _LOGGER.debug("Next Planviewer poll for %s at %s", ", ".join(self.municipalities), self.scheduler.next_poll)
+        async_dispatcher_send(self.hass, SIGNAL_POLL_FINISHED.format(self.config_entry.entry_id))
+
+    async def async_restore(self) -> bool:
+        """Restore the last good data from disk, returning True if a snapshot was found.
+
+        The histories themselves are restored by the hub; snapshots written
+        before the hub kept them still hold them, and fill histories it has not.
+        """
+        snapshot = await self._store.async_load()
+        if not snapshot:
+            return False
+
+        # Older snapshots of single municipality entries hold its history at the top level
+        stored = snapshot.get("municipalities") or ({self.municipalities[0]: snapshot} if "history" in snapshot else {})
+        for municipality in self.municipalities:
+            if municipality in stored and not self.hub.history(municipality).items:
+                self.hub.restore_history(municipality, stored[municipality])
+        if timestamp := snapshot.get("last_update_success_timestamp"):
+            self.last_update_success_timestamp = dt_util.parse_datetime(timestamp)
+
+        self.data = {municipality: self.select(self.hub.history(municipality)) for municipality in self.municipalities}
+        self.last_update_success = True
+        _LOGGER.debug(
+            "Restored %d Planviewer announcements for %s from disk",
+            sum(len(items) for items in self.data.values()), ", ".join(self.municipalities),
+        )
+        return True
+
+    async def async_delayed_refresh(self, delay: float) -> None:
+        """Refresh after a delay, so restored entries do not all hit the site at once."""
+        await asyncio.sleep(delay)
+        await self.async_refresh()
+
+    def _snapshot(self) -> dict:
+        """Return the data of this entry persisted between restarts; the hub saves the shared histories."""
+        timestamp = self.last_update_success_timestamp
+        return {
+            "last_update_success_timestamp": timestamp.isoformat() if timestamp else None,
+        }
+
+    def _handle_scrape_result(
+        self,
+        data: dict[str, list[Announcement]],
+        errors: dict[str, Exception],
+    ) -> dict[str, list[Announcement]] | None:
+        """Record the outcome of a poll and return the data to expose.
+
+        The poll counts as an error only when no municipality could be fetched
+        and at least one failed for another reason than a paused breaker.
+        """
+        self.municipality_errors = errors
+        self._last_update_error = next(reversed(errors.values()), None)
+        if len(errors) == len(self.municipalities):
+            if not all(isinstance(err, PlanviewerCircuitOpenError) for err in errors.values()):
+                self._error_count += 1
+            return self.data # Keep the data, errors were logged per municipality
+        self._error_count = 0
+        self.last_update_success_timestamp = dt_util.utcnow() # Using UTC now for consistency
+        self.data_unchanged = data == self.data # self.data still holds the last good data, errors keep it
+        self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
+        return data
+
+    @callback
+    def async_set_shared_data(self, history: AnnouncementHistory) -> None:
+        """Accept a result the hub fetched for another coordinator watching one of our municipalities."""
+        _LOGGER.debug("Received shared Planviewer data for %s", history.municipality)
+        errors = {key: err for key, err in self.municipality_errors.items() if key != history.municipality}
+        data = self._handle_scrape_result({**(self.data or {}), history.municipality: self.select(history)}, errors)
+        if len(self.municipalities) > 1:
+            # The other municipalities still wait for our own poll, so its timer stays
+            if not self.data_unchanged or not self.last_update_success:
+                self.data = data
+                self.last_update_success = True
+                self.async_update_listeners()
+            return
+        self._async_plan_next_poll()
+        if self.data_unchanged and self.last_update_success:
+            # Nothing to tell the listeners, only push back our own poll
+            self._async_unsub_refresh()
+            if self._listeners:
+                self._schedule_refresh()
+            return
+        # Also resets our refresh timer, so this entry does not fetch the same page again
+        self.async_set_updated_data(data)
+
+    async def _async_update_data(self) -> dict[str, list[Announcement]] | None:
+        """Update data via the shared fetch hub and plan the next poll."""
+        start = time.perf_counter()
         try:
-            data = await self.api_client.async_scrape_data(self.municipality)
-            self._last_update_error = None
-            self._error_count = 0
-            if data is not None:
-                self.last_update_success_timestamp = dt_util.utcnow() # Using UTC now for consistency
-                self.last_data = data # Store the new data
-                return data
+            return await self._async_fetch_data()
+        finally:
+            self.refresh_stats.add(time.perf_counter() - start)
+            self._async_plan_next_poll()
+
+    async def _async_fetch_data(self) -> dict[str, list[Announcement]] | None:
+        """Fetch every municipality via the shared fetch hub, at most fetch_concurrency at a time."""
+        _LOGGER.debug("Fetching Planviewer data for %s", ", ".join(self.municipalities))
+        semaphore = asyncio.Semaphore(self.fetch_concurrency)
+
+        async def fetch(municipality: str) -> AnnouncementHistory:
+            async with semaphore:
+                return await self.hub.async_fetch(municipality, self)
+
+        results = await asyncio.gather(*(fetch(municipality) for municipality in self.municipalities), return_exceptions=True)
+        data = dict(self.data or {})
+        errors: dict[str, Exception] = {}
+        for municipality, result in zip(self.municipalities, results):
+            if isinstance(result, AnnouncementHistory):
+                data[municipality] = self.select(result) # Top N is a view over the stored history
+            elif isinstance(result, Exception):
+                errors[municipality] = result
+                self._log_fetch_error(municipality, result)
             else:
-                _LOGGER.debug("No data received from Planviewer for %s", self.municipality)
-                return self.last_data # Return previous data if available
-        except PlanviewerApiConnectionError as err:
-            self._last_update_error = err
-            self._error_count += 1
+                raise result # Cancellation
+        return self._handle_scrape_result(data, errors)
+
+    def _log_fetch_error(self, municipality: str, err: Exception) -> None:
+        """Log why a municipality could not be fetched."""
+        if isinstance(err, PlanviewerCircuitOpenError):
+            _LOGGER.debug("Skipping Planviewer update: %s", err) # The breaker already reported the failures
+        elif isinstance(err, PlanviewerApiConnectionError):
             _LOGGER.error("Error communicating with Planviewer API: %s", err)
-            return self.last_data # Return previous data on error
-        except PlanviewerApiNotFoundError as err:
-            self._last_update_error = err
-            self._error_count += 1
-            _LOGGER.warning("Planviewer page not found for municipality: %s", self.municipality)
-            return self.last_data # Return previous data on error
-        except Exception as err:
-            self._last_update_error = err
-            self._error_count += 1
-            _LOGGER.error("Error fetching Planviewer data: %s", err)
-            return self.last_data # Return previous data on error
\ No newline at end of file
+        elif isinstance(err, PlanviewerApiNotFoundError):
+            _LOGGER.warning("Planviewer page not found for municipality: %s", municipality)
+        else:
+            _LOGGER.error("Error fetching Planviewer data for %s: %s", municipality, err)
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""Diagnostics support for Planviewer."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import PlanviewerDataUpdateCoordinator
+from .transport import async_get_transport
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: PlanviewerDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": {
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "last_update_success_timestamp": coordinator.last_update_success_timestamp,
+            "last_update_error": repr(coordinator.last_update_error) if coordinator.last_update_error else None,
+            "consecutive_errors": coordinator.error_count,
+            "data_unchanged": coordinator.data_unchanged,
+            "update_interval": str(coordinator.update_interval),
+            "next_poll": coordinator.next_poll,
+            "refresh_seconds": coordinator.refresh_stats.as_dict(),
+            "fetch_concurrency": coordinator.fetch_concurrency,
+            "zones": coordinator.zones,
+        },
+        "transport": {
+            **async_get_transport(hass)[1].as_dict(),
+            "rate_limit_wait": coordinator.hub.api_client.rate_limit_wait.as_dict(),
+        },
+        "municipalities": {
+            municipality: _municipality_diagnostics(coordinator, municipality)
+            for municipality in coordinator.municipalities
+        },
+    }
+
+def _municipality_diagnostics(coordinator: PlanviewerDataUpdateCoordinator, municipality: str) -> dict[str, Any]:
+    """Return the fetch state and history of one municipality of an entry."""
+    hub = coordinator.hub
+    metrics = hub.api_client.metrics.get(municipality)
+    history = hub.history(municipality)
+    error = coordinator.municipality_errors.get(municipality)
+    return {
+        "last_error": repr(error) if error else None,
+        "circuit_breaker": hub.breaker(municipality).as_dict(),
+        "scrape_metrics": metrics.as_dict() if metrics else None,
+        "last_parse": hub.api_client.last_parse_stats.get(municipality),
+        "history": {
+            "items": len(history.items),
+            "cursor": history.cursor,
+            "publication_counts": history.publication_counts,
+            "subscribers": hub.subscriber_count(municipality),
+            "seen_announcements": hub.seen.size(municipality),
+            "located_announcements": len(history.locations),
+        },
+    }
@@ -1,4 +1,7 @@
 """Base entity for Planviewer."""
+from abc import ABC, abstractmethod
+
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -20,4 +23,32 @@ class PlanviewerBaseEntity(CoordinatorEntity[PlanviewerDataUpdateCoordinator]):
             name=f"Planviewer ({self._instance_name})",
             manufacturer=MANUFACTURER,
             model="Scraped Data",
-        )
\ No newline at end of file
+        )
+
+class PlanviewerStateWriteMixin(ABC):
+    """Skip state writes that would not change what the entity shows.
+
+    Entities return a fingerprint of everything their state and attributes are
+    built from. A write is skipped while the fingerprint matches the last one
+    written, so polls that change nothing build no state at all.
+    """
+
+    _written_fingerprint: object = None
+
+    @abstractmethod
+    def state_fingerprint(self) -> object:
+        """Return a fingerprint of what the state and attributes are built from, comparable with ==."""
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and remember its fingerprint."""
+        self._written_fingerprint = self.state_fingerprint()
+        super().async_write_ha_state()
+
+    @callback
+    def async_write_ha_state_if_changed(self) -> None:
+        """Write the state unless its fingerprint matches the last write."""
+        fingerprint = self.state_fingerprint()
+        if fingerprint != self._written_fingerprint:
+            self._written_fingerprint = fingerprint
+            super().async_write_ha_state()
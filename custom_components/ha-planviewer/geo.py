@@ -0,0 +1,130 @@
+"""Geolocation of announcements and a spatial index over them."""
+from __future__ import annotations
+
+import csv
+import logging
+import math
+import re
+from pathlib import Path
+
+from .const import GEO_GRID_CELL
+
+_LOGGER = logging.getLogger(__name__)
+
+EARTH_RADIUS = 6371008.8  # Mean earth radius in meters
+# Dutch postcode: four digits, not starting with 0, and two letters (6411 AB, 6411ab)
+POSTCODE_PATTERN = re.compile(r"\b([1-9]\d{3}) ?([A-Za-z]{2})\b")
+
+Zone = tuple[float, float, float]  # Latitude, longitude and radius in meters
+
+def distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the great-circle distance between two points in meters."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(a))
+
+class GridIndex:
+    """Points bucketed in fixed-size latitude/longitude cells, for radius queries.
+
+    A query only looks at the cells overlapping the bounding box of its circle,
+    so its cost follows the points near the zone, not all points stored.
+    """
+
+    def __init__(self, cell_degrees: float = GEO_GRID_CELL) -> None:
+        """Initialize an empty index."""
+        self._cell_degrees = cell_degrees
+        self._cells: dict[tuple[int, int], dict[str, tuple[float, float]]] = {}
+        self._keys: dict[str, tuple[int, int]] = {}  # Cell of every stored key
+
+    def __len__(self) -> int:
+        """Return the number of points stored."""
+        return len(self._keys)
+
+    def _cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        """Return the cell holding a point."""
+        return math.floor(latitude / self._cell_degrees), math.floor(longitude / self._cell_degrees)
+
+    def add(self, key: str, latitude: float, longitude: float) -> None:
+        """Store a point, replacing an earlier one with the same key."""
+        self.remove(key)
+        cell = self._cell(latitude, longitude)
+        self._cells.setdefault(cell, {})[key] = (latitude, longitude)
+        self._keys[key] = cell
+
+    def remove(self, key: str) -> None:
+        """Drop a point if it is stored."""
+        cell = self._keys.pop(key, None)
+        if cell is None:
+            return
+        bucket = self._cells[cell]
+        del bucket[key]
+        if not bucket:
+            del self._cells[cell]
+
+    def within(self, latitude: float, longitude: float, radius: float) -> set[str]:
+        """Return the keys of the points at most radius meters from a point."""
+        dlat = math.degrees(radius / EARTH_RADIUS)
+        dlon = dlat / max(math.cos(math.radians(latitude)), 1e-6)
+        lat_min, lon_min = self._cell(latitude - dlat, longitude - dlon)
+        lat_max, lon_max = self._cell(latitude + dlat, longitude + dlon)
+        if (lat_max - lat_min + 1) * (lon_max - lon_min + 1) <= len(self._cells):
+            cells = (
+                self._cells.get((lat_cell, lon_cell), {})
+                for lat_cell in range(lat_min, lat_max + 1)
+                for lon_cell in range(lon_min, lon_max + 1)
+            )
+        else:
+            # A zone wider than the occupied area: walking the occupied cells is cheaper
+            cells = (
+                bucket for (lat_cell, lon_cell), bucket in self._cells.items()
+                if lat_min <= lat_cell <= lat_max and lon_min <= lon_cell <= lon_max
+            )
+        return {
+            key
+            for bucket in cells
+            for key, (point_lat, point_lon) in bucket.items()
+            if distance(latitude, longitude, point_lat, point_lon) <= radius
+        }
+
+    def within_any(self, zones: list[Zone]) -> set[str]:
+        """Return the keys of the points inside at least one zone."""
+        keys: set[str] = set()
+        for latitude, longitude, radius in zones:
+            keys |= self.within(latitude, longitude, radius)
+        return keys
+
+class PostcodeTable:
+    """Coordinates of Dutch postcodes, as six-position (6411AB) or four-digit (6411) codes."""
+
+    def __init__(self, coordinates: dict[str, tuple[float, float]] | None = None) -> None:
+        """Initialize the table."""
+        self._coordinates = coordinates or {}
+
+    def __len__(self) -> int:
+        """Return the number of postcodes in the table."""
+        return len(self._coordinates)
+
+    @classmethod
+    def load(cls, path: Path) -> PostcodeTable:
+        """Read a CSV file with postcode, latitude and longitude columns; blocking."""
+        coordinates = {}
+        with path.open(encoding="utf-8", newline="") as file:
+            for row in csv.DictReader(file):
+                try:
+                    postcode = row["postcode"].replace(" ", "").upper()
+                    coordinates[postcode] = (float(row["latitude"]), float(row["longitude"]))
+                except (KeyError, AttributeError, ValueError):
+                    _LOGGER.debug("Skipping malformed postcode row: %s", row)
+        _LOGGER.debug("Loaded %d postcodes from %s", len(coordinates), path)
+        return cls(coordinates)
+
+    def locate(self, text: str) -> tuple[float, float] | None:
+        """Return the coordinates of the first known postcode in a text, if any."""
+        for match in POSTCODE_PATTERN.finditer(text):
+            digits, letters = match.groups()
+            point = self._coordinates.get(digits + letters.upper()) or self._coordinates.get(digits)
+            if point is not None:
+                return point
+        return None
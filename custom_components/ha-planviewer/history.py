@@ -0,0 +1,160 @@
+"""Announcement history kept per municipality."""
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from .const import DEFAULT_HISTORY_SIZE
+from .geo import GridIndex, PostcodeTable
+from .models import Announcement
+from .periods import IntervalIndex, announcement_span
+from .search import InvertedIndex, announcement_tokens
+
+PUBLICATION_SLOTS = 7 * 24
+
+class AnnouncementHistory:
+    """Announcements seen for one municipality, newest first."""
+
+    def __init__(self, municipality: str, max_items: int = DEFAULT_HISTORY_SIZE) -> None:
+        """Initialize an empty history."""
+        self.municipality = municipality
+        self.max_items = max_items
+        self.items: list[Announcement] = []
+        # Sequence number per stored link, counting up as announcements arrive; the
+        # newest item has _newest_sequence, so an item sits at _newest_sequence - number
+        self._links: dict[str, int] = {}
+        self._newest_sequence = 0
+        # New announcements detected per (weekday, hour) slot, index weekday * 24 + hour
+        self.publication_counts: list[int] = [0] * PUBLICATION_SLOTS
+        self.locations = GridIndex()  # Links of the located announcements
+        self._unlocated: set[str] = set()  # Links of unlocated announcements added or updated since the last locate
+        self.terms = InvertedIndex()  # Links of the announcements per search token
+        self.periods = IntervalIndex()  # Links of the dated announcements by the days they run
+        self.revision = 0  # Counts changes to the stored announcements, so an unchanged history is not saved again
+
+    @property
+    def cursor(self) -> str | None:
+        """Return the link of the newest stored announcement, where the next crawl stops."""
+        return self.items[0].link if self.items else None
+
+    def merge(self, new_items: list[Announcement], detected_at: datetime | None = None) -> list[Announcement]:
+        """Prepend newer announcements and return the ones that were not stored yet.
+
+        When detected_at is given, new announcements are counted in its weekday
+        and hour slot, unless this is the first sync (a backfill says nothing
+        about when announcements are published).
+        """
+        first_sync = not self.items
+        added = []
+        links = set()
+        for item in new_items:
+            if item.link not in self._links and item.link not in links:
+                links.add(item.link)
+                if not item.located:
+                    self._unlocated.add(item.link)
+                self.terms.add(item.link, announcement_tokens(item))
+                if span := announcement_span(item):
+                    self.periods.add(item.link, *span)
+                added.append(item)
+        if not added:
+            return added
+        self._newest_sequence += len(added)
+        for offset, item in enumerate(added):
+            self._links[item.link] = self._newest_sequence - offset
+        if detected_at is not None and not first_sync:
+            self.publication_counts[detected_at.weekday() * 24 + detected_at.hour] += len(added)
+
+        self.items[:0] = added
+        self.revision += 1
+        for evicted in self.items[self.max_items:]:
+            del self._links[evicted.link]
+            self.locations.remove(evicted.link)
+            self._unlocated.discard(evicted.link)
+            self.terms.remove(evicted.link)
+            self.periods.remove(evicted.link)
+        del self.items[self.max_items:]
+        return added
+
+    def announcement(self, link: str) -> Announcement | None:
+        """Return the stored announcement with a link, or None if it is not stored."""
+        if (sequence := self._links.get(link)) is None:
+            return None
+        return self.items[self._newest_sequence - sequence]
+
+    def latest(self, count: int) -> list[Announcement]:
+        """Return the newest announcements, which is what the sensors expose."""
+        return self.items[:count]
+
+    def latest_matching(self, count: int, links: set[str]) -> list[Announcement]:
+        """Return the newest announcements among the given links, without scanning the whole history."""
+        positions = sorted(self._newest_sequence - self._links[link] for link in links if link in self._links)
+        return [self.items[position] for position in positions[:count]]
+
+    def running(self, start: date, end: date, links: set[str] | None = None) -> list[Announcement]:
+        """Return the announcements running on any day from start up to end, ordered by start date.
+
+        When links is given, only the announcements among them are returned.
+        """
+        return [self.announcement(link) for link in self.periods.overlapping(start, end) if links is None or link in links]
+
+    def latest_unlocated(self, count: int) -> list[Announcement]:
+        """Return the newest announcements whose location is still unknown."""
+        return [item for item in self.items if not item.located][:count]
+
+    def _replace(self, index: int, item: Announcement) -> None:
+        """Swap in an updated copy of a stored announcement, keeping the spatial index current."""
+        self.items[index] = item
+        self.revision += 1
+        if item.located:
+            self.locations.add(item.link, item.latitude, item.longitude)
+        else:
+            self._unlocated.add(item.link)  # Its address or text may have changed
+        self.terms.add(item.link, announcement_tokens(item))
+
+    def update_details(self, details: dict[str, dict[str, str | float]]) -> None:
+        """Merge detail page fields, keyed by link, into the stored announcements."""
+        for index, item in enumerate(self.items):
+            if (item_details := details.get(item.link)) and (updated := item.with_details(item_details)) is not item:
+                self._replace(index, updated)
+
+    def locate(self, postcodes: PostcodeTable) -> None:
+        """Place announcements without coordinates at the first known postcode in their address or text.
+
+        Only the announcements added or updated since the previous call are
+        tried; the others were already tried with the same address and text.
+        """
+        unlocated, self._unlocated = self._unlocated, set()
+        for link in unlocated:
+            index = self._newest_sequence - self._links[link]
+            item = self.items[index]
+            text = f"{item.adres} {item.vergunning}" if item.adres else item.vergunning
+            if point := postcodes.locate(text):
+                self._replace(index, item.with_location(*point))
+
+    def as_dict(self) -> dict:
+        """Return the history in a form that can be persisted."""
+        return {
+            "items": [item.as_dict() for item in self.items],
+            "publication_counts": self.publication_counts,
+        }
+
+    def restore(self, data: dict) -> None:
+        """Replace the stored announcements with a persisted snapshot."""
+        self.items = [Announcement.from_dict(item, self.municipality) for item in data.get("items", [])[:self.max_items]]
+        self.revision += 1
+        self._newest_sequence = len(self.items)
+        self._links = {item.link: self._newest_sequence - position for position, item in enumerate(self.items)}
+        self.locations = GridIndex()
+        self._unlocated = set()
+        self.terms = InvertedIndex()
+        self.periods = IntervalIndex()
+        for item in self.items:
+            if item.located:
+                self.locations.add(item.link, item.latitude, item.longitude)
+            else:
+                self._unlocated.add(item.link)
+            self.terms.add(item.link, announcement_tokens(item))
+            if span := announcement_span(item):
+                self.periods.add(item.link, *span)
+        counts = data.get("publication_counts")
+        if counts and len(counts) == PUBLICATION_SLOTS:
+            self.publication_counts = list(counts)
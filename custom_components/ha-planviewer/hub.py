@@ -0,0 +1,384 @@
+"""Shared fetch hub for Planviewer coordinators."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import (
+    PlanviewerApiClient,
+    PlanviewerApiClientError,
+    PlanviewerApiConnectionError,
+    PlanviewerApiDataError,
+    PlanviewerApiNotFoundError,
+    announcement_id,
+)
+from .breaker import CircuitBreaker, CircuitState, FailureKind, PlanviewerCircuitOpenError
+from .const import (
+    DOMAIN,
+    STORAGE_VERSION,
+    STORAGE_SAVE_DELAY,
+    DETAILS_STORAGE_KEY,
+    DETAIL_CACHE_SIZE,
+    DETAIL_RETRY_DELAY,
+    DETAIL_MAX_ATTEMPTS,
+    SEEN_STORAGE_KEY,
+    BREAKERS_STORAGE_KEY,
+    HISTORIES_STORAGE_KEY,
+    EVENT_NEW_ANNOUNCEMENT,
+    POSTCODE_FILE,
+)
+from .geo import PostcodeTable
+from .history import AnnouncementHistory
+from .models import Announcement
+from .seen import SeenIndex
+
+if TYPE_CHECKING:
+    from .coordinator import PlanviewerDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+class PlanviewerFetchHub:
+    """Run one scrape per municipality and fan the result out to every subscriber."""
+
+    def __init__(self, hass: HomeAssistant, api_client: PlanviewerApiClient) -> None:
+        """Initialize the hub."""
+        self.hass = hass
+        self.api_client = api_client
+        self._subscribers: dict[str, set[PlanviewerDataUpdateCoordinator]] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._histories: dict[str, AnnouncementHistory] = {}
+        self._histories_store: Store[dict] = Store(hass, STORAGE_VERSION, HISTORIES_STORAGE_KEY)
+        self._saved_histories: dict[str, tuple[int, dict]] = {}  # History revision and validators last saved per municipality
+        self._load_task: asyncio.Task | None = None
+        self._details: dict[str, dict[str, str]] = {}  # Detail page fields per announcement link
+        # Failed fetches per announcement link: attempts so far and when to try again (a POSIX timestamp, None to give up)
+        self._detail_failures: dict[str, dict[str, int | float | None]] = {}
+        self._details_store: Store[dict] = Store(hass, STORAGE_VERSION, DETAILS_STORAGE_KEY)
+        self.seen = SeenIndex()  # Announcements events were already fired (or skipped) for
+        self._seen_store: Store[dict] = Store(hass, STORAGE_VERSION, SEEN_STORAGE_KEY)
+        self.postcodes = PostcodeTable()
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._breakers_store: Store[dict] = Store(hass, STORAGE_VERSION, BREAKERS_STORAGE_KEY)
+
+    async def async_load(self) -> None:
+        """Load the stored state once; entries set up while it loads wait for the same load."""
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(self._async_load())
+        await self._load_task
+
+    async def _async_load(self) -> None:
+        """Load the histories, the detail page cache, the seen index, the circuit breakers and the postcode table from disk."""
+        if stored := await self._histories_store.async_load():
+            for municipality, data in stored.get("municipalities", {}).items():
+                self.restore_history(municipality, data)
+        if stored := await self._details_store.async_load():
+            self._details = stored.get("details", {})
+            self._detail_failures = stored.get("failures", {})
+        if stored := await self._seen_store.async_load():
+            self.seen.restore(stored)
+        if stored := await self._breakers_store.async_load():
+            for municipality, data in stored.get("breakers", {}).items():
+                self.breaker(municipality).restore(data)
+        path = Path(self.hass.config.path(POSTCODE_FILE))
+        if await self.hass.async_add_executor_job(path.exists):
+            try:
+                self.postcodes = await self.hass.async_add_executor_job(PostcodeTable.load, path)
+            except (OSError, UnicodeDecodeError) as err:
+                _LOGGER.warning("Could not read postcode table %s: %s", path, err)
+
+    def history(self, municipality: str) -> AnnouncementHistory:
+        """Return the stored announcements of a municipality."""
+        if municipality not in self._histories:
+            self._histories[municipality] = AnnouncementHistory(municipality)
+        return self._histories[municipality]
+
+    def restore_history(self, municipality: str, data: dict) -> None:
+        """Restore the history and page validators of a municipality saved by _histories_snapshot."""
+        history = self.history(municipality)
+        history.restore(data.get("history", {}))
+        self.api_client.restore_validators(municipality, data.get("validators", {}))
+
+    def _histories_snapshot(self) -> dict:
+        """Return the histories and page validators of every municipality, to persist between restarts."""
+        return {
+            "municipalities": {
+                municipality: {
+                    "history": history.as_dict(),
+                    "validators": self.api_client.validator_snapshot(municipality),
+                }
+                for municipality, history in self._histories.items()
+                if history.items
+            },
+        }
+
+    @callback
+    def _async_save_history(self, municipality: str) -> None:
+        """Schedule saving the histories if the one of a municipality or its page validators changed since the last save."""
+        saved = (self.history(municipality).revision, self.api_client.validator_snapshot(municipality))
+        if self._saved_histories.get(municipality) != saved:
+            self._saved_histories[municipality] = saved
+            self._histories_store.async_delay_save(self._histories_snapshot, STORAGE_SAVE_DELAY)
+
+    def breaker(self, municipality: str) -> CircuitBreaker:
+        """Return the circuit breaker guarding the requests for a municipality."""
+        if municipality not in self._breakers:
+            self._breakers[municipality] = CircuitBreaker()
+        return self._breakers[municipality]
+
+    @callback
+    def async_subscribe(self, municipality: str, coordinator: PlanviewerDataUpdateCoordinator) -> Callable[[], None]:
+        """Register a coordinator for results of the given municipality."""
+        self._subscribers.setdefault(municipality, set()).add(coordinator)
+        self._async_update_issue(municipality)  # Repair issues do not survive a restart, breakers do
+
+        @callback
+        def unsubscribe() -> None:
+            subscribers = self._subscribers.get(municipality)
+            if subscribers is None:
+                return
+            subscribers.discard(coordinator)
+            if not subscribers:
+                del self._subscribers[municipality]
+                self._async_update_issue(municipality)
+
+        return unsubscribe
+
+    def municipalities(self) -> list[str]:
+        """Return the municipalities watched by at least one coordinator."""
+        return list(self._subscribers)
+
+    def subscriber_count(self, municipality: str) -> int:
+        """Return how many coordinators watch the given municipality."""
+        return len(self._subscribers.get(municipality, ()))
+
+    async def async_fetch(self, municipality: str, requester: PlanviewerDataUpdateCoordinator | None = None) -> AnnouncementHistory:
+        """Crawl a municipality and return its history, joining a fetch already in flight."""
+        future = self._inflight.get(municipality)
+        if future is None:
+            future = self.hass.async_create_task(self._async_fetch(municipality, requester))
+            self._inflight[municipality] = future
+            future.add_done_callback(lambda _: self._inflight.pop(municipality, None))
+        else:
+            _LOGGER.debug("Joining in-flight Planviewer fetch for %s", municipality)
+        # Shield so one subscriber being cancelled does not abort the shared fetch
+        return await asyncio.shield(future)
+
+    async def _async_fetch(self, municipality: str, requester: PlanviewerDataUpdateCoordinator | None) -> AnnouncementHistory:
+        """Crawl a municipality once and push the result to the other subscribers."""
+        history = self.history(municipality)
+        subscribers = list(self._subscribers.get(municipality, ()))
+        # The entry asking for the deepest backfill decides how far a crawl may go
+        max_pages = max((coordinator.backfill_pages for coordinator in subscribers), default=1)
+        new_items = await self._async_guarded_crawl(municipality, history.cursor, max_pages)
+        # A backfill of a municipality never seen before is history, not news
+        backfill = not history.items and not self.seen.knows(municipality)
+        now = dt_util.now()
+        added = history.merge(new_items, now)
+        unseen: set[str] = set()
+        if new_items:
+            unseen = set(self.seen.add(municipality, [announcement_id(item.link) for item in new_items], now))
+            self._seen_store.async_delay_save(self.seen.as_dict, STORAGE_SAVE_DELAY)
+        if added:
+            _LOGGER.debug("Stored %d new Planviewer announcements for %s", len(added), municipality)
+        if self.postcodes:
+            history.locate(self.postcodes)
+
+        if candidates := self._enrich_candidates(history, subscribers):
+            await self._async_enrich(history, candidates)
+
+        if unseen and not backfill:
+            # Added announcements lead the history, with detail page fields merged in by now
+            self._async_fire_new_announcements(
+                history,
+                subscribers,
+                [item for item in history.latest(len(added)) if announcement_id(item.link) in unseen],
+            )
+
+        self._async_save_history(municipality)
+        for coordinator in subscribers:
+            if coordinator is not requester:
+                coordinator.async_set_shared_data(history)
+        return history
+
+    async def _async_guarded_crawl(self, municipality: str, cursor: str | None, max_pages: int) -> list[Announcement]:
+        """Crawl a municipality unless its circuit breaker is open, and record the outcome."""
+        breaker = self.breaker(municipality)
+        if not breaker.allow_request(dt_util.utcnow()):
+            raise PlanviewerCircuitOpenError(municipality, breaker.retry_at)
+        if breaker.state == CircuitState.HALF_OPEN:
+            _LOGGER.debug("Probing %s after %d failed attempts", municipality, breaker.failures)
+
+        try:
+            new_items = await self.api_client.async_crawl(municipality, cursor, max_pages)
+        except (PlanviewerApiNotFoundError, PlanviewerApiConnectionError) as err:
+            kind = FailureKind.NOT_FOUND if isinstance(err, PlanviewerApiNotFoundError) else FailureKind.TRANSIENT
+            if breaker.record_failure(kind, dt_util.utcnow()):
+                _LOGGER.warning(
+                    "Pausing requests for %s after %d failed attempts (%s), next attempt at %s",
+                    municipality, breaker.failures, kind, breaker.retry_at,
+                )
+                self._async_update_issue(municipality)
+            self._async_save_breakers()
+            raise
+        except PlanviewerApiDataError:
+            # Planviewer answered, only the page could not be read; a half-open probe must still settle
+            self._async_record_success(municipality)
+            raise
+        self._async_record_success(municipality)
+        return new_items
+
+    @callback
+    def _async_record_success(self, municipality: str) -> None:
+        """Close the breaker of a municipality that answered a request."""
+        breaker = self.breaker(municipality)
+        had_failures = breaker.failures
+        if breaker.record_success():
+            _LOGGER.info("Planviewer requests for %s work again", municipality)
+            self._async_update_issue(municipality)
+        if had_failures:
+            self._async_save_breakers()
+
+    @callback
+    def _async_save_breakers(self) -> None:
+        """Schedule saving the breakers that counted failures."""
+        self._breakers_store.async_delay_save(
+            lambda: {"breakers": {key: breaker.as_dict() for key, breaker in self._breakers.items() if breaker.failures}},
+            STORAGE_SAVE_DELAY,
+        )
+
+    @callback
+    def _async_update_issue(self, municipality: str) -> None:
+        """Raise a repair issue while the breaker of a watched municipality is open, and clear it otherwise."""
+        breaker = self.breaker(municipality)
+        for kind in FailureKind:
+            issue_id = f"{kind}_{municipality}"
+            if breaker.state != CircuitState.CLOSED and breaker.kind == kind and municipality in self._subscribers:
+                ir.async_create_issue(
+                    self.hass,
+                    DOMAIN,
+                    issue_id,
+                    is_fixable=False,
+                    severity=ir.IssueSeverity.ERROR if kind == FailureKind.NOT_FOUND else ir.IssueSeverity.WARNING,
+                    translation_key=f"municipality_{kind}",
+                    translation_placeholders={
+                        "municipality": municipality,
+                        "retry_at": dt_util.as_local(breaker.retry_at).strftime("%Y-%m-%d %H:%M") if breaker.retry_at else "",
+                    },
+                )
+            else:
+                ir.async_delete_issue(self.hass, DOMAIN, issue_id)
+
+    @callback
+    def _async_fire_new_announcements(
+        self,
+        history: AnnouncementHistory,
+        subscribers: list[PlanviewerDataUpdateCoordinator],
+        announcements: list[Announcement],
+    ) -> None:
+        """Fire an event for every announcement that was not seen before, oldest first.
+
+        Entries with zones or keywords only take the announcements passing
+        them; an announcement no entry takes fires no event.
+        """
+        matching = {coordinator: coordinator.matching_links(history) for coordinator in subscribers}
+        for item in reversed(announcements):
+            entry_ids = [
+                coordinator.config_entry.entry_id
+                for coordinator, links in matching.items()
+                if links is None or item.link in links
+            ]
+            if entry_ids:
+                self.hass.bus.async_fire(
+                    EVENT_NEW_ANNOUNCEMENT,
+                    {"id": announcement_id(item.link), **item.as_dict(), "entry_ids": entry_ids},
+                )
+
+    def _enrich_candidates(self, history: AnnouncementHistory, subscribers: list[PlanviewerDataUpdateCoordinator]) -> list[Announcement]:
+        """Return the announcements worth a detail page request for entries that enrich them.
+
+        That is what those entries expose. Entries with zones also need the
+        newest announcements without a location, as the detail page may place
+        them inside a zone; announcements located outside every zone are never
+        fetched. Likewise entries with keywords need the newest announcements
+        without details, whose description may hold the keywords. Only the
+        newest max_announcements are considered, so once those have details
+        a page is fetched per newly published announcement, not for ever
+        older ones.
+        """
+        candidates: dict[str, Announcement] = {}
+        for coordinator in subscribers:
+            if not coordinator.enrich_details:
+                continue
+            items = coordinator.select(history)
+            if coordinator.zones:
+                items += history.latest_unlocated(coordinator.max_announcements)
+            if coordinator.keywords:
+                # Skipping the ones a zone already rules out
+                in_zones = history.locations.within_any(coordinator.zone_areas()) if coordinator.zones else None
+                items += [
+                    item for item in history.latest(coordinator.max_announcements)
+                    if item.link not in self._details and (in_zones is None or not item.located or item.link in in_zones)
+                ]
+            candidates.update((item.link, item) for item in items)
+        return list(candidates.values())
+
+    def _detail_due(self, link: str, now: float) -> bool:
+        """Return True if the detail page of a link is neither cached nor waiting after a failed fetch."""
+        if link in self._details:
+            return False
+        failure = self._detail_failures.get(link)
+        return failure is None or (failure["retry_at"] is not None and now >= failure["retry_at"])
+
+    def _record_detail_failure(self, link: str, error: BaseException, now: float) -> None:
+        """Remember a failed detail page fetch, giving up on a missing page at once and on others after DETAIL_MAX_ATTEMPTS."""
+        attempts = self._detail_failures.get(link, {}).get("attempts", 0) + 1
+        give_up = isinstance(error, PlanviewerApiNotFoundError) or attempts >= DETAIL_MAX_ATTEMPTS
+        self._detail_failures[link] = {
+            "attempts": attempts,
+            "retry_at": None if give_up else now + DETAIL_RETRY_DELAY * 2 ** (attempts - 1),
+        }
+
+    async def _async_enrich(self, history: AnnouncementHistory, candidates: list[Announcement]) -> None:
+        """Merge detail page fields into the given announcements, fetching each page only once.
+
+        A page that fails is tried again after a growing delay, and not at all
+        once it turned out missing or failed DETAIL_MAX_ATTEMPTS times.
+        """
+        now = dt_util.utcnow().timestamp()
+        missing = [item for item in candidates if self._detail_due(item.link, now)]
+        if missing:
+            results = await asyncio.gather(
+                *(self.api_client.async_fetch_details(item.link) for item in missing),
+                return_exceptions=True,
+            )
+            for item, result in zip(missing, results):
+                if isinstance(result, (PlanviewerApiClientError, asyncio.TimeoutError)):
+                    _LOGGER.debug("Could not fetch details of %s: %s", item.link, result)
+                    self._record_detail_failure(item.link, result, now)
+                elif isinstance(result, BaseException):
+                    # The other pages are still cached
+                    _LOGGER.warning("Unexpected error fetching details of %s", item.link, exc_info=result)
+                    self._record_detail_failure(item.link, result, now)
+                else:
+                    self._details[item.link] = result
+                    self._detail_failures.pop(item.link, None)
+            # Oldest entries go first once the cache is full
+            for cache in (self._details, self._detail_failures):
+                for link in list(cache)[:max(len(cache) - DETAIL_CACHE_SIZE, 0)]:
+                    del cache[link]
+            self._details_store.async_delay_save(
+                lambda: {"details": self._details, "failures": self._detail_failures},
+                STORAGE_SAVE_DELAY,
+            )
+
+        history.update_details(self._details)
+        if self.postcodes:
+            history.locate(self.postcodes)  # Detail pages may have added an address
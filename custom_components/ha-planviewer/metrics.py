@@ -0,0 +1,75 @@
+"""Rolling scrape metrics for Planviewer."""
+from __future__ import annotations
+
+from collections import deque
+
+from .const import METRICS_WINDOW
+
+SCRAPE_PHASES = ("ttfb", "download", "parse", "extract")
+
+class RollingStats:
+    """The last samples of one measurement, with percentiles over them."""
+
+    def __init__(self, size: int = METRICS_WINDOW) -> None:
+        """Initialize an empty window."""
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def add(self, value: float) -> None:
+        """Record a sample, dropping the oldest once the window is full."""
+        self._samples.append(value)
+
+    @classmethod
+    def combined(cls, windows: list[RollingStats]) -> RollingStats:
+        """Return one window holding the samples of several, for percentiles across them."""
+        stats = cls(max(sum(len(window._samples) for window in windows), 1))
+        for window in windows:
+            stats._samples.extend(window._samples)
+        return stats
+
+    def percentile(self, pct: float) -> float | None:
+        """Return the pct-th percentile of the window, or None without samples."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+    def as_dict(self) -> dict:
+        """Return a summary of the window."""
+        return {
+            "count": len(self._samples),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "max": max(self._samples, default=None),
+        }
+
+class ScrapeMetrics:
+    """Per-phase timings, sizes and cache hits of the scrapes of one municipality.
+
+    Phases are ttfb (request sent until response headers, so DNS, connection
+    setup and the time the server takes to answer; the transport stats split
+    off the first two), download (reading the body), parse (building the tree)
+    and extract (reading the announcements from it). Fetch is ttfb plus
+    download. Times are in seconds.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.phases = {phase: RollingStats() for phase in SCRAPE_PHASES}
+        self.fetch = RollingStats()
+        self.response_bytes = RollingStats()
+        self.items = RollingStats()
+        self.requests = 0
+        self.not_modified = 0  # 304 responses
+        self.content_unchanged = 0  # 200 responses whose container hash matched
+
+    def as_dict(self) -> dict:
+        """Return the metrics for diagnostics."""
+        return {
+            "phases": {phase: stats.as_dict() for phase, stats in self.phases.items()},
+            "fetch": self.fetch.as_dict(),
+            "response_bytes": self.response_bytes.as_dict(),
+            "items": self.items.as_dict(),
+            "requests": self.requests,
+            "not_modified_rate": self.not_modified / self.requests if self.requests else None,
+            "content_unchanged_rate": self.content_unchanged / self.requests if self.requests else None,
+        }
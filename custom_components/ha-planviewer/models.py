@@ -0,0 +1,103 @@
+"""Announcement records for Planviewer."""
+from __future__ import annotations
+
+import logging
+import sys
+from dataclasses import dataclass, fields, replace
+from datetime import datetime
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+LIST_DATE_FORMAT = "%d-%m-%Y"  # Format of the dates in the announcement list
+DETAIL_FIELDS = ("adres", "zaaknummer", "omschrijving", "latitude", "longitude")  # Filled in from the detail page
+
+def parse_list_date(value: str | None) -> datetime | None:
+    """Return a date from the announcement list, or None when it is missing or malformed."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, LIST_DATE_FORMAT)
+    except ValueError:
+        _LOGGER.warning("Could not parse date: %s", value)
+        return None
+
+def _parse_stored_date(value: str) -> datetime | None:
+    """Return a persisted date, which earlier versions stored for datum_eind as shown in the list."""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return parse_list_date(value)
+
+@dataclass(frozen=True, slots=True)
+class Announcement:
+    """One announcement of a municipality.
+
+    Records are immutable and have no per-instance __dict__, so a history of
+    hundreds of municipalities stays small. Municipality and status repeat on
+    every record and are interned, which makes them one shared string each.
+    """
+
+    municipality: str
+    vergunning: str  # Full message, taken from the link slug
+    link: str
+    status: str | None = None  # Label shown in the list, such as "Bekendmaking"
+    datum_start: datetime | None = None
+    datum_eind: datetime | None = None
+    adres: str | None = None
+    zaaknummer: str | None = None
+    omschrijving: str | None = None
+    latitude: float | None = None  # From the detail page or the postcode in the text
+    longitude: float | None = None
+
+    def __post_init__(self) -> None:
+        """Intern the strings every record of a municipality repeats."""
+        object.__setattr__(self, "municipality", sys.intern(self.municipality))
+        if self.status is not None:
+            object.__setattr__(self, "status", sys.intern(self.status))
+
+    @property
+    def located(self) -> bool:
+        """Return True if the announcement has coordinates."""
+        return self.latitude is not None and self.longitude is not None
+
+    def with_location(self, latitude: float, longitude: float) -> Announcement:
+        """Return the announcement placed at the given coordinates."""
+        return replace(self, latitude=latitude, longitude=longitude)
+
+    def with_details(self, details: dict[str, str | float]) -> Announcement:
+        """Return the announcement with detail page fields merged in, or itself if nothing changes."""
+        changes = {key: value for key, value in details.items() if key in DETAIL_FIELDS and getattr(self, key) != value}
+        return replace(self, **changes) if changes else self
+
+    def attributes(self) -> dict[str, Any]:
+        """Return the state attributes of a sensor exposing this announcement."""
+        attributes = {
+            "status": self.status,
+            "datum_start": self.datum_start,
+            "datum_eind": self.datum_eind,
+            "link": self.link,
+        }
+        for key in DETAIL_FIELDS:
+            if (value := getattr(self, key)) is not None:
+                attributes[key] = value
+        return attributes
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable form of the announcement, leaving out empty fields."""
+        data = {}
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if value is not None:
+                data[field.name] = value.isoformat() if isinstance(value, datetime) else value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], municipality: str) -> Announcement:
+        """Rebuild an announcement stored by as_dict, or a dict stored by earlier versions."""
+        values = {field.name: data[field.name] for field in fields(cls) if data.get(field.name) is not None}
+        values.setdefault("municipality", municipality)
+        for key in ("datum_start", "datum_eind"):
+            if key in values:
+                values[key] = _parse_stored_date(values[key])
+        return cls(**values)
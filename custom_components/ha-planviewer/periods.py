@@ -0,0 +1,85 @@
+"""Periods during which announcements run, and an interval index over them."""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator
+from datetime import date, timedelta
+
+from .models import Announcement
+
+Span = tuple[date, date]  # First day and the day after the last, like an all-day calendar event
+
+def announcement_span(item: Announcement) -> Span | None:
+    """Return the days an announcement runs, from datum_start through datum_eind, or None without a start date.
+
+    An announcement without an end date, or with one before its start, runs
+    for its start day only.
+    """
+    if item.datum_start is None:
+        return None
+    start = item.datum_start.date()
+    last = item.datum_eind.date() if item.datum_eind is not None else start
+    return start, max(last, start) + timedelta(days=1)
+
+class IntervalIndex:
+    """Spans sorted by start date, for overlap queries.
+
+    Next to the starts, the index keeps the running maximum of the ends. That
+    maximum never decreases along the list, so the first span that can still
+    overlap a query is found by bisecting it, just as the last one is found by
+    bisecting the starts; a query only walks the spans between the two.
+    Adding or removing a span updates the running maximum from its position
+    on, which stops early as soon as it no longer changes.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._starts: list[tuple[date, str]] = []  # (start, key), sorted
+        self._ends: list[date] = []  # End of the span at the same position
+        self._max_ends: list[date] = []  # Latest end up to and including the same position
+        self._spans: dict[str, Span] = {}
+
+    def __len__(self) -> int:
+        """Return the number of spans stored."""
+        return len(self._spans)
+
+    def add(self, key: str, start: date, end: date) -> None:
+        """Store a span, replacing an earlier one with the same key."""
+        self.remove(key)
+        index = bisect_left(self._starts, (start, key))
+        self._starts.insert(index, (start, key))
+        self._ends.insert(index, end)
+        self._max_ends.insert(index, end)
+        self._spans[key] = (start, end)
+        self._update_max_ends(index)
+
+    def remove(self, key: str) -> None:
+        """Drop a span if it is stored."""
+        span = self._spans.pop(key, None)
+        if span is None:
+            return
+        index = bisect_left(self._starts, (span[0], key))
+        del self._starts[index]
+        del self._ends[index]
+        del self._max_ends[index]
+        self._update_max_ends(index)
+
+    def _update_max_ends(self, index: int) -> None:
+        """Recompute the running maximum of the ends from a changed position on."""
+        running = self._max_ends[index - 1] if index else date.min
+        for position in range(index, len(self._ends)):
+            running = max(running, self._ends[position])
+            if position > index and self._max_ends[position] == running:
+                break  # Every later maximum already includes this one
+            self._max_ends[position] = running
+
+    def overlapping(self, start: date, end: date) -> list[str]:
+        """Return the keys of the spans sharing a day with [start, end), ordered by start date."""
+        first = bisect_right(self._max_ends, start)  # Every span before it ends on or before start
+        last = bisect_left(self._starts, (end,))  # Every span from here on starts on or after end
+        return [self._starts[position][1] for position in range(first, last) if self._ends[position] > start]
+
+    def starting_from(self, day: date) -> Iterator[str]:
+        """Yield the keys of the spans starting on or after a day, ordered by start date."""
+        for position in range(bisect_left(self._starts, (day,)), len(self._starts)):
+            yield self._starts[position][1]
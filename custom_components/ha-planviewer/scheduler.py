@@ -0,0 +1,70 @@
+"""Adaptive poll scheduling for Planviewer coordinators."""
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+
+from .const import (
+    MIN_POLL_INTERVAL,
+    MAX_BACKOFF_INTERVAL,
+    PUBLICATION_MIN_SAMPLES,
+    PUBLICATION_WINDOW_SPEEDUP,
+    QUIET_WINDOW_SLOWDOWN,
+    POLL_JITTER,
+)
+
+def publication_activity(counts: list[int], when: datetime) -> float | None:
+    """Return how busy the weekday/hour slot of `when` is relative to the average slot.
+
+    Returns None while too few publications have been seen to tell.
+    """
+    total = sum(counts)
+    if total < PUBLICATION_MIN_SAMPLES:
+        return None
+    return counts[when.weekday() * 24 + when.hour] * len(counts) / total
+
+class AdaptivePollScheduler:
+    """Pick the delay until the next poll of one coordinator.
+
+    Polls speed up in weekday/hour slots where the municipality has published
+    well above average, slow down in slots where it never has, back off
+    exponentially after errors, and are jittered so entries drift apart.
+    """
+
+    def __init__(self, base_interval: timedelta) -> None:
+        """Initialize the scheduler."""
+        self.base_interval = base_interval
+        self.next_poll: datetime | None = None
+        self._random = random.Random()
+
+    def next_interval(
+        self,
+        now: datetime,
+        publication_counts: list[int],
+        error_count: int,
+        not_before: datetime | None = None,
+    ) -> timedelta:
+        """Return the interval until the next poll and remember when that is.
+
+        A poll is never planned before not_before, when requests are paused.
+        """
+        base = self.base_interval.total_seconds()
+        if error_count:
+            seconds = min(base * 2 ** error_count, MAX_BACKOFF_INTERVAL)
+        else:
+            activity = publication_activity(publication_counts, now)
+            if activity is None:
+                seconds = base
+            elif activity >= 2:
+                seconds = max(base / PUBLICATION_WINDOW_SPEEDUP, MIN_POLL_INTERVAL)
+            elif activity == 0:
+                seconds = base * QUIET_WINDOW_SLOWDOWN
+            else:
+                seconds = base
+
+        seconds = max(seconds * (1 + self._random.uniform(-POLL_JITTER, POLL_JITTER)), MIN_POLL_INTERVAL)
+        if not_before is not None:
+            seconds = max(seconds, (not_before - now).total_seconds())
+        interval = timedelta(seconds=seconds)
+        self.next_poll = now + interval
+        return interval
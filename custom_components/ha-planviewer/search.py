@@ -0,0 +1,133 @@
+"""Keyword search over stored announcements."""
+from __future__ import annotations
+
+import re
+import unicodedata
+
+from .models import Announcement
+
+VOWELS = frozenset("aeiouy")
+# Words too common in announcements to narrow a search down
+STOPWORDS = frozenset({
+    "aan", "bij", "de", "door", "een", "en", "het", "in", "met", "naar", "of",
+    "om", "op", "over", "te", "ten", "ter", "tot", "uit", "van", "voor",
+})
+# Diminutive endings, longest first: boompje, huisje, balletje
+DIMINUTIVE_SUFFIXES = ("etjes", "etje", "pjes", "pje", "tjes", "tje", "jes", "je")
+VOICED_FINALS = {"z": "s", "v": "f"}  # A singular ends in s or f where its plural has z or v: huis, huizen
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+OR_PATTERN = re.compile(r"\s+(?:OR|\|)\s+|\s*\|\s*")  # "dakkapel OR boom" or "dakkapel | boom"
+
+def _fold(text: str) -> str:
+    """Return text in lower case with accents removed, so "geëxploiteerd" matches "geexploiteerd"."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+def stem(word: str) -> str:
+    """Reduce a Dutch word to a stem shared by its plural and diminutive forms.
+
+    A light stemmer: it strips diminutive and plural endings and restores the
+    spelling of the singular, so "bomen" and "boom", "dakkapellen" and
+    "dakkapel", "aanvragen" and "aanvraag", "huizen" and "huis", and
+    "bedrijven" and "bedrijf" end up as the same token. A final e after a
+    consonant is dropped as well, as words in -e form their plural with -n
+    alone: "gemeente" and "gemeenten" both become "gemeent".
+    """
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    for suffix in DIMINUTIVE_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return _undouble(word[:-len(suffix)])
+    if word.endswith("en") and len(word) >= 5 and word[-3] not in VOWELS:
+        base = word[:-2]
+        if base[-1] == base[-2]:
+            return base[:-1]  # Closed syllable: kappen, dakkapellen
+        if base[-2] in "aeou" and base[-3] not in VOWELS:
+            base = base[:-1] + base[-2] + base[-1]  # Open syllable: bomen, aanvragen
+        return base[:-1] + VOICED_FINALS.get(base[-1], base[-1])  # huizen, bedrijven
+    if word.endswith("s") and word[-2] not in VOWELS and word[-2] not in "sj":
+        word = word[:-1]
+    if word.endswith("e") and word[-2] not in VOWELS:
+        return word[:-1]
+    return word
+
+def _undouble(word: str) -> str:
+    """Drop a doubled final consonant left behind by a stripped ending."""
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in VOWELS:
+        return word[:-1]
+    return word
+
+def tokenize(text: str) -> list[str]:
+    """Return the normalized search tokens of a text, without stopwords."""
+    return [stem(word) for word in TOKEN_PATTERN.findall(_fold(text)) if word not in STOPWORDS]
+
+def announcement_tokens(announcement: Announcement) -> frozenset[str]:
+    """Return the tokens an announcement can be found by: its message, list label and detail fields."""
+    text = " ".join(
+        value for value in (
+            announcement.vergunning,
+            announcement.status,
+            announcement.adres,
+            announcement.zaaknummer,
+            announcement.omschrijving,
+        ) if value
+    )
+    return frozenset(tokenize(text))
+
+class SearchQuery:
+    """A keyword query: alternatives separated by OR, each a set of terms that must all match."""
+
+    def __init__(self, text: str, groups: list[frozenset[str]]) -> None:
+        """Initialize the query."""
+        self.text = text
+        self.groups = groups
+
+    @classmethod
+    def parse(cls, text: str) -> SearchQuery:
+        """Parse a query such as "dakkapel OR boom kappen"."""
+        groups = [frozenset(tokenize(part)) for part in OR_PATTERN.split(text.strip())]
+        return cls(text, [group for group in groups if group])
+
+    def __bool__(self) -> bool:
+        """Return False for a query without any searchable term."""
+        return bool(self.groups)
+
+class InvertedIndex:
+    """Posting sets of keys per token, maintained as documents come and go."""
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._postings: dict[str, set[str]] = {}
+        self._documents: dict[str, frozenset[str]] = {}  # Tokens of every key, to remove it again
+
+    def __len__(self) -> int:
+        """Return the number of indexed documents."""
+        return len(self._documents)
+
+    def add(self, key: str, tokens: frozenset[str]) -> None:
+        """Index a document, replacing an earlier version with the same key."""
+        previous = self._documents.get(key)
+        if previous == tokens:
+            return
+        if previous is not None:
+            self.remove(key)
+        self._documents[key] = tokens
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        """Drop a document if it is indexed."""
+        for token in self._documents.pop(key, ()):
+            postings = self._postings[token]
+            postings.discard(key)
+            if not postings:
+                del self._postings[token]
+
+    def search(self, query: SearchQuery) -> set[str]:
+        """Return the keys matching any alternative of the query."""
+        keys: set[str] = set()
+        for group in query.groups:
+            postings = sorted((self._postings.get(token, set()) for token in group), key=len)
+            if postings[0]:
+                keys |= postings[0].intersection(*postings[1:])
+        return keys
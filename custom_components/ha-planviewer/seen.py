@@ -0,0 +1,57 @@
+"""Bounded index of announcements already seen per municipality."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from .const import SEEN_INDEX_SIZE, SEEN_MAX_AGE_DAYS
+
+class SeenIndex:
+    """Announcement IDs seen per municipality, with when they were last seen.
+
+    IDs are kept in least recently seen order. A municipality holds at most
+    max_items IDs, and IDs that were not seen again within max_age are dropped,
+    so the index stays bounded however long Home Assistant runs.
+    """
+
+    def __init__(self, max_items: int = SEEN_INDEX_SIZE, max_age: timedelta = timedelta(days=SEEN_MAX_AGE_DAYS)) -> None:
+        """Initialize an empty index."""
+        self.max_items = max_items
+        self.max_age = max_age
+        self._seen: dict[str, OrderedDict[str, float]] = {}
+
+    def knows(self, municipality: str) -> bool:
+        """Return True if announcements of the municipality were recorded before."""
+        return bool(self._seen.get(municipality))
+
+    def size(self, municipality: str) -> int:
+        """Return how many IDs are remembered for a municipality."""
+        return len(self._seen.get(municipality, ()))
+
+    def add(self, municipality: str, ids: list[str], now: datetime) -> list[str]:
+        """Mark IDs as seen now and return the ones that were not seen before."""
+        seen = self._seen.setdefault(municipality, OrderedDict())
+        timestamp = now.timestamp()
+        unseen = []
+        for announcement_id in ids:
+            if announcement_id in seen:
+                seen.move_to_end(announcement_id)
+            else:
+                unseen.append(announcement_id)
+            seen[announcement_id] = timestamp
+
+        cutoff = timestamp - self.max_age.total_seconds()
+        while seen and (len(seen) > self.max_items or next(iter(seen.values())) < cutoff):
+            seen.popitem(last=False)
+        return unseen
+
+    def as_dict(self) -> dict:
+        """Return the index in a form that can be persisted."""
+        return {"municipalities": {municipality: dict(seen) for municipality, seen in self._seen.items()}}
+
+    def restore(self, data: dict) -> None:
+        """Replace the index with a persisted one."""
+        self._seen = {
+            municipality: OrderedDict(sorted(seen.items(), key=lambda item: item[1]))
+            for municipality, seen in data.get("municipalities", {}).items()
+        }
@@ -3,16 +3,22 @@
 import logging
 from datetime import datetime
 
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
+from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EntityCategory
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, Platform, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.typing import StateType
 
-from .const import DOMAIN, CONF_INSTANCE_NAME
+from .api import announcement_id
+from .const import DOMAIN, CONF_INSTANCE_NAME, SIGNAL_POLL_FINISHED
 from .coordinator import PlanviewerDataUpdateCoordinator
+from .entity import PlanviewerStateWriteMixin
+from .metrics import RollingStats
+from .models import DETAIL_FIELDS, Announcement
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,36 +30,118 @@ async def async_setup_entry(
     """Set up the Planviewer sensors from config entry."""
     coordinator: PlanviewerDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
     instance_name = entry.data[CONF_INSTANCE_NAME]
-    municipality_name = entry.data["municipality"].upper().replace(" ", "_") # Get municipality and format for ID
-    sensors = []
-    if coordinator.data:
-        for index, announcement in enumerate(coordinator.data):
-            sensors.append(PlanviewerAnnouncementSensor(coordinator, instance_name, municipality_name, announcement, index))
+    municipality_name = municipality_label(coordinator.municipalities[0]) # First municipality, formatted for ID
+
+    # Announcement sensors follow the coordinator data, added and removed as announcements change
+    manager = PlanviewerAnnouncementEntityManager(hass, coordinator, instance_name, async_add_entities)
+    manager.async_remove_stale_entities()
+    manager.async_update()
+    entry.async_on_unload(coordinator.async_add_listener(manager.async_update))
 
     # Add diagnostic sensors
-    sensors.extend([
+    async_add_entities([
         PlanviewerDiagnosticSensor(coordinator, instance_name, municipality_name, "last_update_status", "Last Update Status"),
         PlanviewerDiagnosticSensor(coordinator, instance_name, municipality_name, "last_update_time", "Coordinator Last Update", SensorDeviceClass.TIMESTAMP),
         PlanviewerDiagnosticSensor(coordinator, instance_name, municipality_name, "consecutive_errors", "Consecutive Update Errors"),
+        PlanviewerDiagnosticSensor(coordinator, instance_name, municipality_name, "next_poll", "Next Planned Poll", SensorDeviceClass.TIMESTAMP),
     ])
+    # Scrape phase percentiles, disabled by default
+    async_add_entities(
+        PlanviewerMetricSensor(coordinator, instance_name, municipality_name, data_key) for data_key in METRIC_SENSORS
+    )
+
+# Metric sensor key -> (name, scrape phase or "fetch", percentile)
+METRIC_SENSORS = {
+    "fetch_latency_p50": ("Fetch Latency p50", "fetch", 50),
+    "fetch_latency_p95": ("Fetch Latency p95", "fetch", 95),
+    "parse_time_p50": ("Parse Time p50", "parse", 50),
+    "parse_time_p95": ("Parse Time p95", "parse", 95),
+}
+
+def municipality_label(municipality: str) -> str:
+    """Return a municipality formatted for sensor names and IDs."""
+    return municipality.upper().replace(" ", "_")
 
-    async_add_entities(sensors)
+def announcement_unique_id(coordinator: PlanviewerDataUpdateCoordinator, announcement_key: str) -> str:
+    """Return the unique ID of the sensor for an announcement."""
+    return f"{DOMAIN}_{coordinator.config_entry.entry_id}_announcement_{announcement_key}"
+
+class PlanviewerAnnouncementEntityManager:
+    """Keep one sensor per exposed announcement, diffing on every coordinator update."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: PlanviewerDataUpdateCoordinator,
+        instance_name: str,
+        async_add_entities: AddEntitiesCallback,
+    ) -> None:
+        """Initialize the entity manager."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._instance_name = instance_name
+        self._async_add_entities = async_add_entities
+        self._entities: dict[str, PlanviewerAnnouncementSensor] = {}
 
-class PlanviewerAnnouncementSensor(CoordinatorEntity[PlanviewerDataUpdateCoordinator], SensorEntity):
+    def _current_announcements(self) -> dict[str, Announcement]:
+        """Return the announcements the coordinator exposes for all its municipalities, keyed by announcement ID."""
+        return {
+            announcement_id(announcement.link): announcement
+            for announcements in (self.coordinator.data or {}).values()
+            for announcement in announcements
+        }
+
+    @callback
+    def async_remove_stale_entities(self) -> None:
+        """Drop registry entries of announcements that are no longer exposed."""
+        registry = er.async_get(self.hass)
+        current = {announcement_unique_id(self.coordinator, key) for key in self._current_announcements()}
+        for registry_entry in er.async_entries_for_config_entry(registry, self.coordinator.config_entry.entry_id):
+            if (
+                registry_entry.domain == Platform.SENSOR
+                and "_diag_" not in registry_entry.unique_id
+                and registry_entry.unique_id not in current
+            ):
+                registry.async_remove(registry_entry.entity_id)
+
+    @callback
+    def async_update(self) -> None:
+        """Add new announcement sensors, remove dropped ones and update the rest in place."""
+        announcements = self._current_announcements()
+
+        for key in set(self._entities) - set(announcements):
+            entity = self._entities.pop(key)
+            registry = er.async_get(self.hass)
+            if entity.entity_id and registry.async_get(entity.entity_id):
+                registry.async_remove(entity.entity_id) # Also removes the entity from the state machine
+            else:
+                self.hass.async_create_task(entity.async_remove())
+
+        new_entities = []
+        for key, announcement in announcements.items():
+            if key in self._entities:
+                self._entities[key].async_set_announcement(announcement)
+            else:
+                self._entities[key] = PlanviewerAnnouncementSensor(self.coordinator, self._instance_name, key, announcement)
+                new_entities.append(self._entities[key])
+        if new_entities:
+            self._async_add_entities(new_entities)
+
+class PlanviewerAnnouncementSensor(PlanviewerStateWriteMixin, CoordinatorEntity[PlanviewerDataUpdateCoordinator], SensorEntity):
     """Representation of a Planviewer announcement sensor."""
 
     _attr_has_entity_name = False # We will construct the name
+    # Fixed for the life of the sensor or only filled in once, and long: not worth a row on every change
+    _unrecorded_attributes = frozenset({"datum_start", "datum_eind", "link", *DETAIL_FIELDS})
 
-    def __init__(self, coordinator: PlanviewerDataUpdateCoordinator, instance_name: str, municipality_name: str, announcement: dict, index: int) -> None:
+    def __init__(self, coordinator: PlanviewerDataUpdateCoordinator, instance_name: str, announcement_key: str, announcement: Announcement) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
         self._instance_name = instance_name
-        self._municipality_name = municipality_name
-        self._announcement = announcement
-        self._index = index
-        announcement_title_slug = self._announcement.get('vergunning', 'announcement').lower().replace(" ", "_")
-        self._attr_unique_id = f"{DOMAIN}_{self._municipality_name}_{coordinator.config_entry.entry_id}_{index + 1}_{announcement_title_slug}"
-        self._attr_name = f"{self._municipality_name} {index + 1}"
+        self._municipality_name = municipality_label(announcement.municipality)
+        self._attr_unique_id = announcement_unique_id(coordinator, announcement_key)
+        self._attr_name = f"{self._municipality_name} {announcement.vergunning}"
+        self._apply_announcement(announcement)
 
     @property
     def device_info(self) -> dict:
@@ -67,21 +155,30 @@ class PlanviewerAnnouncementSensor(CoordinatorEntity[PlanviewerDataUpdateCoordin
             "model": "Announcement Sensor",
         }
 
-    @property
-    def native_value(self) -> str | None:
-        """Return the state of the sensor."""
-        return self._announcement.get("vergunning")
+    def _apply_announcement(self, announcement: Announcement) -> None:
+        """Store the announcement and build the state and attributes it shows, once per change."""
+        self._announcement = announcement
+        self._attr_native_value = announcement.vergunning
+        self._attr_extra_state_attributes = announcement.attributes()
 
-    @property
-    def extra_state_attributes(self) -> dict[str, any]:
-        """Return the state attributes of the sensor."""
-        attributes = {}
-        for key in self._announcement:
-            if key not in ["vergunning"]:
-                attributes[key] = self._announcement.get(key)
-        return attributes
-
-class PlanviewerDiagnosticSensor(CoordinatorEntity[PlanviewerDataUpdateCoordinator], SensorEntity):
+    def state_fingerprint(self) -> Announcement:
+        """Return the announcement, an immutable record the state and attributes are built from."""
+        return self._announcement
+
+    @callback
+    def async_set_announcement(self, announcement: Announcement) -> None:
+        """Update the announcement in place and write the new state if it changed."""
+        if announcement is self._announcement:
+            return # The history hands over the same record while an announcement is unchanged
+        self._apply_announcement(announcement)
+        if self.hass is not None:
+            self.async_write_ha_state_if_changed()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Leave updates to the entity manager, which hands over the new announcement."""
+
+class PlanviewerDiagnosticSensor(PlanviewerStateWriteMixin, CoordinatorEntity[PlanviewerDataUpdateCoordinator], SensorEntity):
     """Representation of a Planviewer Diagnostic Sensor."""
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_has_entity_name = False
@@ -116,18 +213,75 @@ class PlanviewerDiagnosticSensor(CoordinatorEntity[PlanviewerDataUpdateCoordinat
             "model": "Diagnostic Sensor",
         }
 
+    async def async_added_to_hass(self) -> None:
+        """Also update after polls that did not change the data, which skip coordinator listeners."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_POLL_FINISHED.format(self.coordinator.config_entry.entry_id),
+                self.async_write_ha_state_if_changed,
+            )
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the value changed."""
+        self.async_write_ha_state_if_changed()
+
+    def state_fingerprint(self) -> StateType:
+        """Return the state as written, the only part that changes; timestamps to the second."""
+        return self.state
+
     @property
     def native_value(self) -> StateType:
         """Return the state of the diagnostic sensor."""
         if self._data_key == "last_update_status":
+            if self.coordinator.partial_failure:
+                return "Partial" # Some municipalities failed, the others were updated
             return "OK" if not self.coordinator.last_update_error else "Error"
         elif self._data_key == "last_update_time":
             return self.coordinator.last_update_success_timestamp
         elif self._data_key == "consecutive_errors":
             return self.coordinator.error_count
+        elif self._data_key == "next_poll":
+            return self.coordinator.next_poll
         return None
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator is not None
\ No newline at end of file
+        return self.coordinator is not None
+
+class PlanviewerMetricSensor(PlanviewerDiagnosticSensor):
+    """Percentile of a scrape phase over the recent polls of the municipalities of an entry."""
+
+    _attr_entity_registry_enabled_default = False
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: PlanviewerDataUpdateCoordinator,
+        instance_name: str,
+        municipality_name: str,
+        data_key: str,
+    ) -> None:
+        """Initialize the metric sensor."""
+        name, self._metric, self._percentile = METRIC_SENSORS[data_key]
+        super().__init__(coordinator, instance_name, municipality_name, data_key, name, SensorDeviceClass.DURATION)
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the percentile in milliseconds, across the recent polls of all municipalities of the entry."""
+        all_metrics = self.coordinator.hub.api_client.metrics
+        windows = [
+            metrics.fetch if self._metric == "fetch" else metrics.phases[self._metric]
+            for municipality in self.coordinator.municipalities
+            if (metrics := all_metrics.get(municipality)) is not None
+        ]
+        if not windows:
+            return None
+        stats = windows[0] if len(windows) == 1 else RollingStats.combined(windows)
+        value = stats.percentile(self._percentile)
+        return round(value * 1000, 1) if value is not None else None
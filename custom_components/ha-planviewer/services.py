@@ -0,0 +1,54 @@
+"""Services of the Planviewer integration."""
+from __future__ import annotations
+
+from datetime import datetime
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+
+from .api import announcement_id
+from .const import DOMAIN, DATA_HUB, SERVICE_SEARCH, ATTR_QUERY, ATTR_MUNICIPALITY, ATTR_LIMIT, DEFAULT_SEARCH_LIMIT
+from .search import SearchQuery
+
+SEARCH_SCHEMA = vol.Schema({
+    vol.Required(ATTR_QUERY): cv.string,
+    vol.Optional(ATTR_MUNICIPALITY): cv.string,
+    vol.Optional(ATTR_LIMIT, default=DEFAULT_SEARCH_LIMIT): vol.All(vol.Coerce(int), vol.Range(min=1, max=500)),
+})
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Planviewer services."""
+
+    async def async_search(call: ServiceCall) -> ServiceResponse:
+        """Return the stored announcements matching a keyword query, newest first."""
+        hub = hass.data.get(DOMAIN, {}).get(DATA_HUB)
+        if hub is None:
+            raise ServiceValidationError("No Planviewer entries are set up")
+        query = SearchQuery.parse(call.data[ATTR_QUERY])
+        if not query:
+            raise ServiceValidationError(f"The query {call.data[ATTR_QUERY]!r} has no searchable words")
+
+        municipalities = hub.municipalities()
+        if ATTR_MUNICIPALITY in call.data:
+            if call.data[ATTR_MUNICIPALITY] not in municipalities:
+                raise ServiceValidationError(f"No Planviewer entry watches {call.data[ATTR_MUNICIPALITY]}")
+            municipalities = [call.data[ATTR_MUNICIPALITY]]
+
+        count, matches = 0, []
+        for municipality in municipalities:
+            history = hub.history(municipality)
+            links = history.terms.search(query)
+            count += len(links)
+            # Histories are newest first, so only the first few of every municipality can make the cut
+            matches += history.latest_matching(call.data[ATTR_LIMIT], links)
+        # Stable, so announcements of the same day keep their newest-first history order
+        matches.sort(key=lambda item: item.datum_start or datetime.min, reverse=True)
+        return {
+            "count": count,
+            "announcements": [{"id": announcement_id(item.link), **item.as_dict()} for item in matches[:call.data[ATTR_LIMIT]]],
+        }
+
+    hass.services.async_register(DOMAIN, SERVICE_SEARCH, async_search, schema=SEARCH_SCHEMA, supports_response=SupportsResponse.ONLY)
@@ -0,0 +1,124 @@
+"""HTTP transport for requests to Planviewer."""
+from __future__ import annotations
+
+import ssl
+import time
+from types import SimpleNamespace
+
+import aiohttp
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util.ssl import get_default_context
+
+from .api import TokenBucket
+from .const import (
+    DATA_TRANSPORT,
+    DEFAULT_REQUEST_RATE,
+    DEFAULT_REQUEST_BURST,
+    HTTP_CONNECTION_LIMIT,
+    HTTP_CONNECTIONS_PER_HOST,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_TOTAL_TIMEOUT,
+)
+from .metrics import RollingStats
+
+try:
+    from aiohttp.compression_utils import HAS_BROTLI
+except ImportError:
+    HAS_BROTLI = False
+
+# Listing pages compress about tenfold; brotli only when aiohttp can decode it
+ACCEPT_ENCODING = "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate"
+
+class TransportStats:
+    """Connection reuse and DNS and connection setup times of the session."""
+
+    def __init__(self) -> None:
+        """Initialize empty stats."""
+        self.dns = RollingStats()
+        self.connect = RollingStats()  # New connections only, including the TLS handshake
+        self.connections_created = 0
+        self.connections_reused = 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Return a trace config recording into these stats."""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_dns_start(session, context: SimpleNamespace, params) -> None:
+            context.dns_start = time.perf_counter()
+
+        async def on_dns_end(session, context: SimpleNamespace, params) -> None:
+            self.dns.add(time.perf_counter() - context.dns_start)
+
+        async def on_connection_start(session, context: SimpleNamespace, params) -> None:
+            context.connect_start = time.perf_counter()
+
+        async def on_connection_end(session, context: SimpleNamespace, params) -> None:
+            self.connect.add(time.perf_counter() - context.connect_start)
+            self.connections_created += 1
+
+        async def on_connection_reused(session, context: SimpleNamespace, params) -> None:
+            self.connections_reused += 1
+
+        trace_config.on_dns_resolvehost_start.append(on_dns_start)
+        trace_config.on_dns_resolvehost_end.append(on_dns_end)
+        trace_config.on_connection_create_start.append(on_connection_start)
+        trace_config.on_connection_create_end.append(on_connection_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reused)
+        return trace_config
+
+    def as_dict(self) -> dict:
+        """Return the stats for diagnostics."""
+        connections = self.connections_created + self.connections_reused
+        return {
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_rate": self.connections_reused / connections if connections else None,
+            "dns": self.dns.as_dict(),
+            "connect": self.connect.as_dict(),
+        }
+
+def create_session(stats: TransportStats | None = None, ssl_context: ssl.SSLContext | bool = True) -> aiohttp.ClientSession:
+    """Return a session tuned for Planviewer: few kept-alive connections, compression and explicit timeouts."""
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_CONNECTION_LIMIT,
+        limit_per_host=HTTP_CONNECTIONS_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        ssl=ssl_context,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(
+            total=HTTP_TOTAL_TIMEOUT,
+            sock_connect=HTTP_CONNECT_TIMEOUT,
+            sock_read=HTTP_READ_TIMEOUT,
+        ),
+        headers={"Accept-Encoding": ACCEPT_ENCODING},
+        trace_configs=[stats.trace_config()] if stats else None,
+    )
+
+@callback
+def async_get_transport(hass: HomeAssistant) -> tuple[aiohttp.ClientSession, TransportStats, TokenBucket]:
+    """Return the session every Planviewer request goes through, with its stats and rate limit.
+
+    The session is created on first use, by the config flow or the first
+    entry, and closed when Home Assistant shuts down. Every client built on
+    it takes the same rate limit, so the catalog download and the hub share
+    the request budget.
+    """
+    if DATA_TRANSPORT not in hass.data:
+        stats = TransportStats()
+        # The default context is loaded once by Home Assistant, so creating it here does not block
+        session = create_session(stats, get_default_context())
+
+        async def async_close(event: Event) -> None:
+            await session.close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, async_close)
+        hass.data[DATA_TRANSPORT] = session, stats, TokenBucket(DEFAULT_REQUEST_RATE, DEFAULT_REQUEST_BURST)
+    return hass.data[DATA_TRANSPORT]
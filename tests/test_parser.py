@@ -0,0 +1,82 @@
+"""Equivalence of the lxml and BeautifulSoup listing page parsers."""
+from __future__ import annotations
+
+import importlib
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from fixtures import SIZES, announcement_paths, render_item, render_page  # noqa: E402
+
+def import_component(module: str):
+    """Import a module of the integration, whose directory name is not a valid package name."""
+    if "planviewer" not in sys.modules:
+        package = types.ModuleType("planviewer")
+        package.__path__ = [str(ROOT / "custom_components" / "ha-planviewer")]
+        sys.modules["planviewer"] = package
+    return importlib.import_module(f"planviewer.{module}")
+
+api = import_component("api")
+
+def parse_both(html: str) -> tuple:
+    """Return the announcements both parsers find on a page."""
+    return api._parse_lxml(html, "heerlen", {}), api._parse_soup(html, "heerlen", {})
+
+@pytest.mark.parametrize("size", list(SIZES))
+def test_fixture_sizes(size: str) -> None:
+    """Both parsers read the same announcements from every fixture size."""
+    spec = SIZES[size]
+    html = render_page(announcement_paths("heerlen", spec["items"]), spec["nav_links"])
+    fast, soup = parse_both(html)
+    assert len(fast) == spec["items"]
+    assert fast == soup
+
+def test_items_without_expected_elements() -> None:
+    """Items lacking a title or dates are treated alike."""
+    paths = announcement_paths("heerlen", 3)
+    no_title = f'<a href="{paths[0]}"><div class="row"><span>01-02-2024</span><span>15-03-2024</span></div></a>'
+    no_dates = f'<a href="{paths[1]}"><div class="row"><span class="col-10 col-sm-6 col-md-7 tbl-btm-row-icon-col">Bekendmaking</span></div></a>'
+    page = render_page([], 0).replace('<div class="list">', f'<div class="list">{no_title}{no_dates}{render_item(paths[2], 2)}')
+    fast, soup = parse_both(page)
+    assert [item.link for item in fast] == [f"{api.BASE_URL}{paths[1]}", f"{api.BASE_URL}{paths[2]}"]
+    assert fast[0].datum_start is None
+    assert fast == soup
+
+@pytest.mark.parametrize(
+    "damage",
+    [
+        pytest.param(lambda html: html[:html.rfind("</a>")], id="truncated"),
+        pytest.param(lambda html: html.replace("</div></a>", "</a>", 2), id="unclosed_divs"),
+        pytest.param(lambda html: html.replace("</span>", "", 1), id="unclosed_span"),
+        pytest.param(lambda html: html.replace("-2024<", "-20x4<"), id="bad_dates"),
+    ],
+)
+def test_malformed_pages(damage) -> None:
+    """Broken markup gives the same announcements with either parser."""
+    html = damage(render_page(announcement_paths("heerlen", 20), 50))
+    fast, soup = parse_both(html)
+    assert fast
+    assert fast == soup
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        pytest.param("", id="empty"),
+        pytest.param("<html><body><p>Geen bekendmakingen</p></body></html>", id="no_container"),
+        pytest.param('<html><body><script>var cls = "imro-address-list-page";</script></body></html>', id="marker_in_script"),
+    ],
+)
+def test_container_missing(html: str) -> None:
+    """Both parsers report a page without announcement container as None."""
+    assert parse_both(html) == (None, None)
+    assert api.parse_announcements(html) is None
+
+def test_detail_page_with_xml_declaration() -> None:
+    """A detail page opening with an XML declaration is parsed like any other."""
+    html = '<?xml version="1.0" encoding="utf-8"?><html><body><dl><dt>Adres</dt><dd>Akerstraat 1, 6411 HA Heerlen</dd></dl></body></html>'
+    assert api.parse_detail(html) == {"adres": "Akerstraat 1, 6411 HA Heerlen"}
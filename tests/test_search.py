@@ -0,0 +1,26 @@
+"""Stemming of Dutch plurals and diminutives for the keyword search."""
+from __future__ import annotations
+
+import pytest
+
+from test_parser import import_component
+
+search = import_component("search")
+
+@pytest.mark.parametrize(
+    ("singular", "other"),
+    [
+        ("boom", "bomen"),
+        ("dakkapel", "dakkapellen"),
+        ("aanvraag", "aanvragen"),
+        ("gemeente", "gemeenten"),
+        ("huis", "huizen"),
+        ("bedrijf", "bedrijven"),
+        ("woning", "woningen"),
+        ("boom", "boompje"),
+        ("huis", "huisje"),
+    ],
+)
+def test_plural_and_diminutive_match_singular(singular: str, other: str) -> None:
+    """A plural or diminutive reduces to the same token as its singular."""
+    assert search.stem(singular) == search.stem(other)